@@ -1,6 +1,7 @@
 from datetime import datetime
 import json
 import os
+import threading
 import time
 from typing import Dict, List, Optional
 
@@ -15,12 +16,18 @@ from web3 import Web3
 
 load_dotenv(dotenv_path='../.env', override=True)
 
+# SubgraphClient.for_url's clients, kept per thread since requests.Session is not thread-safe
+_subgraph_clients = threading.local()
+
 class SubgraphClient:
     """A class to handle subgraph API requests."""
 
     def __init__(self, url, headers):
         self.url = url
         self.headers = headers
+        # Keep-alive session so every page after the first reuses the open connection
+        self.session = requests.Session()
+        self.session.headers.update(headers)
 
     def fetch_subgraph_data(self, query, method):
         all_results = []
@@ -30,9 +37,8 @@ class SubgraphClient:
         while True:
             print(f"Fetching transactions with skip={skip}...")
 
-            response = requests.post(
+            response = self.session.post(
                 url = self.url,
-                headers = self.headers,
                 json={"query": query, "variables": {"skip": skip}}
             )
 
@@ -65,7 +71,7 @@ class SubgraphClient:
         Returns:
             pandas.DataFrame: The fetched data as a DataFrame, or None if no data
         """
-        subgraph = SubgraphClient(url=subgraph_url, headers=SubgraphClient.SUBGRAPH_HEADERS)
+        subgraph = SubgraphClient.for_url(subgraph_url)
         
         print(f"🔍 Trying {query_key} query...")
         try:
@@ -81,6 +87,17 @@ class SubgraphClient:
             print(f"❌ {query_key} query failed: {e}")
             return None
     
+    @staticmethod
+    def for_url(subgraph_url):
+        """Shared client (and connection pool) per subgraph URL and thread, built on first use."""
+        clients = getattr(_subgraph_clients, 'by_url', None)
+        if clients is None:
+            clients = _subgraph_clients.by_url = {}
+        client = clients.get(subgraph_url)
+        if client is None:
+            client = clients[subgraph_url] = SubgraphClient(url=subgraph_url, headers=SubgraphClient.SUBGRAPH_HEADERS)
+        return client
+
     SUBGRAPH_HEADERS = {
         "Content-Type": "application/json",
     }
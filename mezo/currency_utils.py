@@ -1,5 +1,6 @@
 from decimal import Decimal
 import os
+import time
 
 import pandas as pd
 import requests
@@ -12,6 +13,11 @@ from mezo.currency_config import (
     TOKENS_ID_MAP,
 )
 
+# CoinGecko prices are shared by every Conversions instance for a few minutes,
+# so converting several tables in one run costs a single API call
+PRICE_CACHE_TTL_SECONDS = 300
+_price_cache = {'prices': None, 'fetched_at': 0.0}
+
 
 class Conversions:
 
@@ -85,7 +91,11 @@ class Conversions:
         return df_result
     
     def get_token_prices(self):
-        """ Retrieves USD conversion price for all tokens from Coingecko """
+        """ Retrieves USD conversion price for all tokens from Coingecko (cached for PRICE_CACHE_TTL_SECONDS) """
+        cached = _price_cache['prices']
+        if cached is not None and time.monotonic() - _price_cache['fetched_at'] < PRICE_CACHE_TTL_SECONDS:
+            return cached.copy()
+
         url = 'https://api.coingecko.com/api/v3/simple/price'
         params = {'ids': TOKENS_ID, 'vs_currencies': 'usd'}
         headers = {'x-cg-demo-api-key': self.coingecko_key}
@@ -95,7 +105,11 @@ class Conversions:
         data = response.json()
         df = pd.DataFrame(data)
 
-        return df
+        if response.ok and not df.empty:
+            _price_cache['prices'] = df
+            _price_cache['fetched_at'] = time.monotonic()
+
+        return df.copy()
 
     def get_token_price(self, token_id):
         """ Retrieves a single token's USD conversion price from Coingecko """
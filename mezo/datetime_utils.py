@@ -24,12 +24,17 @@ def convert_unix_to_datetime(df, columns):
 
 def format_datetimes(df, date_columns):
     df[date_columns] = df[date_columns].astype(float)
-    df = convert_unix_to_datetime(df, date_columns)
     
-    # Convert to date, handling mixed tz-aware/tz-naive values
+    # Same rules as convert_unix_to_datetime, applied to whole columns with one parse each
     for col in date_columns:
-        # Convert to datetime, coercing errors, then normalize timezone
-        dt_series = pd.to_datetime(df[col], errors='coerce', utc=True)
+        values = df[col]
+        is_unix = values.between(1e9, 1e16)
+        # Scale millisecond (13 digit) and microsecond (16 digit) timestamps to seconds
+        seconds = values.where(values <= 1e12, values / 1000).where(values <= 1e15, values / 1e6)
+        dt_series = pd.to_datetime(seconds.where(is_unix), unit='s', errors='coerce', utc=True)
+        # Anything else goes through pd.to_datetime as a plain number, as before
+        if not is_unix.all():
+            dt_series = dt_series.where(is_unix, pd.to_datetime(values.where(~is_unix), errors='coerce', utc=True))
         # Extract date (returns tz-naive date objects)
         df[col] = dt_series.dt.date
     
@@ -8,13 +8,17 @@ This script:
 3. Uploads reports to Linear docs via GraphQL API
 """
 
+import io
 import os
 import sys
 import json
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,6 +31,44 @@ LINEAR_PROJECT_ID='8cf7b30b-0031-4f26-b3ad-59828750fce3'
 LINEAR_DOC_ID = None
 LINEAR_SUMMARY_DOC_ID = 'd35f442d-73f8-4462-a1fb-f8e99704ae96'
 
+# timestamp shown at the top of every generated report
+REPORT_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S UTC'
+
+# format_number scale thresholds, and its "$x.xxM" / "$x.xxK" / "$x.xx" templates
+# keyed by decimals (built on first use so each call skips rebuilding the format spec)
+_MILLION = 1_000_000
+_THOUSAND = 1_000
+_NUMBER_TEMPLATES: Dict[int, tuple] = {}
+
+# markdown table headers and row templates shared across report calls
+_POOLS_TVL_HEADER = """
+| Pool | Current TVL | Token 0 | Token 1 | Transactions | Users |
+|------|-------------|---------|---------|--------------|-------|
+"""
+_POOLS_EFF_HEADER = """
+| Rank | Pool | Efficiency Score | Volume/TVL Ratio | Fee APR |
+|------|------|------------------|------------------|---------|
+"""
+_POOLS_EFF_ROW = "| {rank} | **{pool}** | {score:.1f}/100 | {ratio:.3f} | {apr} |\n"
+_POOLS_DAILY_HEADER = """
+| Date | TVL | Daily Change | Deposits | Withdrawals | Net Flow |
+|------|-----|--------------|----------|-------------|----------|
+"""
+_BRIDGE_PERIOD_HEADER = """
+| Period | Count | Amount | % Change |
+|--------|-------|--------|----------|
+"""
+_BRIDGE_NET_HEADER = """
+| Period | Net Count | Net Amount | % Change |
+|--------|-----------|------------|----------|
+"""
+_BRIDGE_PERIOD_ROW = "| **{period}** | {count:,} | {amount} | {pct} |\n"
+_BRIDGE_TOKEN_HEADER = """
+| Token | Total Volume | Share | Net Flow |
+|-------|--------------|-------|----------|
+"""
+_BRIDGE_TOKEN_ROW = "| **{token}** | {volume} | {share:.1f}% | {net_flow} |\n"
+
 # ==================================================
 # LINEAR API CLIENT
 # ==================================================
@@ -42,6 +84,20 @@ class LinearAPIClient:
             "Content-Type": "application/json"
         }
 
+        # reuse one pooled connection across uploads instead of a new TLS handshake per call
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            read=0,  # a POST that reached Linear may already have applied its mutation
+            status_forcelist=[429],  # rate-limited requests are rejected unprocessed, so safe to resend
+            allowed_methods=frozenset(["POST"]),  # every Linear call is a GraphQL POST
+            raise_on_status=False  # fall through to the status check below once retries run out
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+        self.session.mount("https://", adapter)
+
     def execute_query(self, query: str, variables: dict = None):
         """Execute a GraphQL query against Linear API."""
         payload = {
@@ -49,10 +105,10 @@ class LinearAPIClient:
             "variables": variables or {}
         }
         
-        response = requests.post(
+        response = self.session.post(
             self.base_url,
-            headers=self.headers,
-            json=payload
+            json=payload,
+            timeout=30
         )
         
         if response.status_code != 200:
@@ -143,27 +199,87 @@ class LinearAPIClient:
 class ReportGenerator:
     """Generate markdown reports from processing script outputs."""
     
+    @staticmethod
+    def _is_missing(value):
+        """Check for None/NaN, using a self-comparison for plain floats before pd.isna."""
+        if value is None:
+            return True
+        if isinstance(value, float):
+            return value != value
+        return pd.isna(value)
+
     @staticmethod
     def format_number(value: float, decimals: int = 2):
         """Format number with commas and decimals."""
-        if pd.isna(value) or value is None:
+        if ReportGenerator._is_missing(value):
             return "N/A"
-        if value >= 1_000_000:
-            return f"${value/1_000_000:,.{decimals}f}M"
-        elif value >= 1_000:
-            return f"${value/1_000:,.{decimals}f}K"
+        templates = _NUMBER_TEMPLATES.get(decimals)
+        if templates is None:
+            templates = _NUMBER_TEMPLATES[decimals] = tuple(
+                f"${{:,.{decimals}f}}{unit}".format for unit in ('M', 'K', '')
+            )
+        if value >= _MILLION:
+            return templates[0](value / _MILLION)
+        elif value >= _THOUSAND:
+            return templates[1](value / _THOUSAND)
         else:
-            return f"${value:,.{decimals}f}"
+            return templates[2](value)
     
     @staticmethod
     def format_percentage(value: float, decimals: int = 2):
         """Format percentage value."""
-        if pd.isna(value) or value is None:
+        if ReportGenerator._is_missing(value):
             return "N/A"
         return f"{value:.{decimals}f}%"
+
+    @staticmethod
+    def _format_number_vec(values: pd.Series, decimals: int = 2):
+        """Vectorized format_number: pick the M/K/plain scale with np.select over the whole column."""
+        v = values.to_numpy(dtype=float)
+        conditions = [v >= _MILLION, v >= _THOUSAND]
+        scaled = np.select(conditions, [v / _MILLION, v / _THOUSAND], default=v)
+        suffix = np.select(conditions, ['M', 'K'], default='')
+        formatted = [f"${x:,.{decimals}f}{unit}" for x, unit in zip(scaled.tolist(), suffix.tolist())]
+        return pd.Series(np.where(np.isnan(v), "N/A", formatted), index=values.index)
+
+    @staticmethod
+    def _format_percentage_vec(values: pd.Series, decimals: int = 2):
+        """Vectorized format_percentage."""
+        v = values.to_numpy(dtype=float)
+        formatted = np.char.mod(f'%.{decimals}f%%', v)
+        return pd.Series(np.where(np.isnan(v), "N/A", formatted), index=values.index)
+
+    @staticmethod
+    def _daily_flow_table(days_ago: np.ndarray, type_codes: np.ndarray, amounts: np.ndarray):
+        """
+        Count and sum transactions per (day offset, type) in one pass.
+
+        Args:
+            days_ago: Integer day offset of each transaction from the latest date
+            type_codes: 0 for deposits, 1 for withdrawals, -1 for anything else
+            amounts: USD amount of each transaction
+
+        Returns:
+            Tuple of (counts, sums) arrays shaped (n_days, 2), column 0 deposits, column 1 withdrawals
+        """
+        valid = type_codes >= 0
+        keys = days_ago[valid] * 2 + type_codes[valid]
+        size = 2 * (int(days_ago.max()) + 1) if len(days_ago) > 0 else 2
+        counts = np.bincount(keys, minlength=size).reshape(-1, 2)
+        sums = np.bincount(keys, weights=np.nan_to_num(amounts[valid]), minlength=size).reshape(-1, 2)
+        return counts, sums
+
+    @staticmethod
+    def _pct_changes(current: np.ndarray, previous: np.ndarray):
+        """Format element-wise % change against previous-period values, N/A where there is no base."""
+        prev_abs = np.abs(previous)
+        pct = np.divide(current - previous, prev_abs, out=np.full(current.shape, np.nan), where=prev_abs > 0) * 100
+        return np.where(np.isnan(pct), "N/A", np.char.mod('%+.1f%%', pct)).tolist()
     
-    def generate_pools_report(self, pools_data: Dict[str, Any]):
-        """Generate markdown report for pools data."""
+    def generate_pools_report(self, pools_data: Dict[str, Any], generated_at: Optional[str] = None):
+        """Generate markdown report for pools data, written section by section into one buffer."""
+        buf = io.StringIO()
+        generated_at = generated_at or datetime.now(timezone.utc).strftime(REPORT_TIMESTAMP_FORMAT)
         
         # Extract data from pools processing
         tvl_snapshot = pools_data.get('tvl_snapshot')
@@ -175,18 +291,53 @@ class ReportGenerator:
         daily_pool_tvl = pools_data.get('daily_pool_tvl')
         daily_protocol_tvl = pools_data.get('daily_protocol_tvl')
         
+        # Decide once which sections have data; empty sections are left out entirely
+        has_tvl = tvl_snapshot is not None and not tvl_snapshot.empty
+        has_efficiency = efficiency_metrics is not None and not efficiency_metrics.empty
+        has_daily = daily_protocol_tvl is not None and not daily_protocol_tvl.empty
+
+        # Per-pool TVL is read once and shared by the TVL table filter and the risk indicators
+        if has_tvl:
+            pool_tvls = tvl_snapshot['current_tvl_total'].to_numpy()
+
+        # Extract the protocol TVL column once and reduce the last 7 days in a single agg call
+        if has_daily:
+            tvl_arr = daily_protocol_tvl['protocol_tvl_total'].to_numpy()
+            recent_data = daily_protocol_tvl.tail(7)
+            highlights = recent_data.agg({
+                'protocol_tvl_total': 'max',
+                'protocol_daily_deposits': 'mean',
+                'protocol_daily_withdrawals': 'mean',
+                'protocol_daily_net_flow': 'sum',
+                'protocol_unique_users': 'sum'
+            })
+
+        # Extract efficiency columns once for the summary and top performers
+        avg_efficiency = 0
+        if has_efficiency:
+            pool_names = efficiency_metrics['pool'].to_numpy()
+            scores = efficiency_metrics['efficiency_score'].to_numpy()
+            fee_aprs = efficiency_metrics['fee_apr'].to_numpy()
+            capital_efficiency = efficiency_metrics['capital_efficiency'].to_numpy()
+            avg_efficiency = np.nanmean(scores)
+
+            # Top 5 pools by score via a partial sort; shared by the rankings table
+            # and the best overall pool insight
+            top_n = min(5, len(scores))
+            top_idx = np.argpartition(-scores, top_n - 1)[:top_n]
+            top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
+
         # Calculate 7-day metrics
         seven_day_tvl_change = 0
         seven_day_volume = 0
-        if daily_protocol_tvl is not None and len(daily_protocol_tvl) > 7:
-            current_tvl = daily_protocol_tvl.iloc[-1]['protocol_tvl_total']
-            week_ago_tvl = daily_protocol_tvl.iloc[-8]['protocol_tvl_total']
+        if has_daily and len(daily_protocol_tvl) > 7:
+            current_tvl, week_ago_tvl = tvl_arr[-1], tvl_arr[-8]
             if week_ago_tvl > 0:
                 seven_day_tvl_change = ((current_tvl - week_ago_tvl) / week_ago_tvl) * 100
         
         # Build markdown report
-        report = f"""# 🏊 Liquidity Pools Analytics Report
-*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}*
+        buf.write(f"""# 🏊 Liquidity Pools Analytics Report
+*Generated: {generated_at}*
 
 ---
 
@@ -197,103 +348,126 @@ class ReportGenerator:
 |--------|-------|-----------|
 | **Total TVL** | {self.format_number(total_tvl)} | {self.format_percentage(seven_day_tvl_change)} |
 | **Active Pools** | {active_pools} | - |
-| **Avg Pool Efficiency** | {self.format_percentage(efficiency_metrics['efficiency_score'].mean() if efficiency_metrics is not None else 0)} | - |
+| **Avg Pool Efficiency** | {self.format_percentage(avg_efficiency)} | - |
+""")
 
+        if has_tvl or has_efficiency:
+            buf.write("""
 ---
 
 ## 💰 Pool Performance Breakdown
-
-### TVL by Pool
-"""
+""")
         
         # Add pool TVL table
-        if tvl_snapshot is not None and len(tvl_snapshot) > 0:
-            report += """
-| Pool | Current TVL | Token 0 | Token 1 | Transactions | Users |
-|------|-------------|---------|---------|--------------|-------|
-"""
-            for _, row in tvl_snapshot.iterrows():
-                if row['current_tvl_total'] > 0:
-                    report += f"| **{row['pool']}** | {self.format_number(row['current_tvl_total'])} | {row['token0']} | {row['token1']} | {row['total_transactions']:,} | {row['unique_users']:,} |\n"
+        if has_tvl:
+            buf.write("""
+### TVL by Pool
+""")
+            buf.write(_POOLS_TVL_HEADER)
+            funded = tvl_snapshot[pool_tvls > 0]
+            if not funded.empty:
+                rows = (
+                    "| **" + funded['pool'].astype(str)
+                    + "** | " + self._format_number_vec(funded['current_tvl_total'])
+                    + " | " + funded['token0'].astype(str)
+                    + " | " + funded['token1'].astype(str)
+                    + " | " + funded['total_transactions'].map('{:,}'.format)
+                    + " | " + funded['unique_users'].map('{:,}'.format)
+                    + " |\n"
+                )
+                buf.write(rows.str.cat())
         
         # Add efficiency metrics
-        report += """
+        if has_efficiency:
+            buf.write("""
 
 ### 🏆 Pool Efficiency Rankings
-"""
-        
-        if efficiency_metrics is not None and len(efficiency_metrics) > 0:
-            report += """
-| Rank | Pool | Efficiency Score | Volume/TVL Ratio | Fee APR |
-|------|------|------------------|------------------|---------|
-"""
-            efficiency_sorted = efficiency_metrics.sort_values('efficiency_score', ascending=False)
-            for idx, (_, row) in enumerate(efficiency_sorted.head(5).iterrows(), 1):
-                report += f"| {idx} | **{row['pool']}** | {row['efficiency_score']:.1f}/100 | {row['volume_tvl_ratio']:.3f} | {self.format_percentage(row['fee_apr'])} |\n"
+""")
+            buf.write(_POOLS_EFF_HEADER)
+            for idx, row in enumerate(efficiency_metrics.iloc[top_idx].itertuples(index=False), 1):
+                buf.write(_POOLS_EFF_ROW.format_map({
+                    'rank': idx,
+                    'pool': row.pool,
+                    'score': row.efficiency_score,
+                    'ratio': row.volume_tvl_ratio,
+                    'apr': self.format_percentage(row.fee_apr)
+                }))
         
         # Add trends section
-        report += """
+        if has_daily:
+            buf.write(f"""
 
 ---
 
 ## 📈 Historical Trends
 
 ### 7-Day Highlights
-"""
-        
-        if daily_protocol_tvl is not None and len(daily_protocol_tvl) > 0:
-            recent_data = daily_protocol_tvl.tail(7)
-            
-            report += f"""
-- **Peak TVL:** {self.format_number(recent_data['protocol_tvl_total'].max())}
-- **Average Daily Volume:** {self.format_number(recent_data['protocol_daily_deposits'].mean() + recent_data['protocol_daily_withdrawals'].mean())}
-- **Net Flow (7D):** {self.format_number(recent_data['protocol_daily_net_flow'].sum())}
-- **Active Users (7D):** {int(recent_data['protocol_unique_users'].sum()):,}
+
+- **Peak TVL:** {self.format_number(highlights['protocol_tvl_total'])}
+- **Average Daily Volume:** {self.format_number(highlights['protocol_daily_deposits'] + highlights['protocol_daily_withdrawals'])}
+- **Net Flow (7D):** {self.format_number(highlights['protocol_daily_net_flow'])}
+- **Active Users (7D):** {int(highlights['protocol_unique_users']):,}
 
 ### Daily TVL Trend (Last 7 Days)
-"""
-            report += """
-| Date | TVL | Daily Change | Deposits | Withdrawals | Net Flow |
-|------|-----|--------------|----------|-------------|----------|
-"""
-            for _, row in recent_data.iterrows():
-                date_str = row['date'].strftime('%Y-%m-%d') if hasattr(row['date'], 'strftime') else str(row['date'])
-                report += f"| {date_str} | {self.format_number(row['protocol_tvl_total'])} | {self.format_percentage(row.get('protocol_tvl_change_pct', 0))} | {self.format_number(row['protocol_daily_deposits'])} | {self.format_number(row['protocol_daily_withdrawals'])} | {self.format_number(row['protocol_daily_net_flow'])} |\n"
+""")
+            buf.write(_POOLS_DAILY_HEADER)
+            recent_dates = recent_data['date']
+            if pd.api.types.is_datetime64_any_dtype(recent_dates):
+                date_strs = recent_dates.dt.strftime('%Y-%m-%d')
+            else:
+                date_strs = recent_dates.map(lambda d: d.strftime('%Y-%m-%d') if hasattr(d, 'strftime') else str(d))
+            if 'protocol_tvl_change_pct' in recent_data:
+                changes = self._format_percentage_vec(recent_data['protocol_tvl_change_pct'])
+            else:
+                changes = self.format_percentage(0)
+            rows = (
+                "| " + date_strs
+                + " | " + self._format_number_vec(recent_data['protocol_tvl_total'])
+                + " | " + changes
+                + " | " + self._format_number_vec(recent_data['protocol_daily_deposits'])
+                + " | " + self._format_number_vec(recent_data['protocol_daily_withdrawals'])
+                + " | " + self._format_number_vec(recent_data['protocol_daily_net_flow'])
+                + " |\n"
+            )
+            buf.write(rows.str.cat())
         
         # Add pool-specific insights
-        report += """
+        if has_tvl or has_efficiency:
+            buf.write("""
 
 ---
 
 ## 💡 Key Insights
-
-### Top Performers
-"""
+""")
         
-        if efficiency_metrics is not None and len(efficiency_metrics) > 0:
-            best_pool = efficiency_metrics.loc[efficiency_metrics['efficiency_score'].idxmax()]
-            highest_apr_pool = efficiency_metrics.loc[efficiency_metrics['fee_apr'].idxmax()]
+        if has_efficiency:
+            best_i = top_idx[0]
+            apr_i = np.nanargmax(fee_aprs)
+            capital_i = np.nanargmax(capital_efficiency)
             
-            report += f"""
-1. **Best Overall Pool:** {best_pool['pool']} (Score: {best_pool['efficiency_score']:.1f}/100)
-2. **Highest Fee APR:** {highest_apr_pool['pool']} ({self.format_percentage(highest_apr_pool['fee_apr'])})
-3. **Most Capital Efficient:** {efficiency_metrics.loc[efficiency_metrics['capital_efficiency'].idxmax()]['pool']}
-"""
+            buf.write(f"""
+### Top Performers
+
+1. **Best Overall Pool:** {pool_names[best_i]} (Score: {scores[best_i]:.1f}/100)
+2. **Highest Fee APR:** {pool_names[apr_i]} ({self.format_percentage(fee_aprs[apr_i])})
+3. **Most Capital Efficient:** {pool_names[capital_i]}
+""")
         
         # Add risk indicators
-        if tvl_snapshot is not None and len(tvl_snapshot) > 0:
-            total_tvl = tvl_snapshot['current_tvl_total'].sum()
-            if total_tvl > 0:
-                concentration = tvl_snapshot.nlargest(1, 'current_tvl_total')['current_tvl_total'].sum() / total_tvl * 100
+        if has_tvl:
+            snapshot_tvl = np.nansum(pool_tvls)
+            if snapshot_tvl > 0:
+                concentration = np.nanmax(pool_tvls) / snapshot_tvl * 100
+                small_pools = int((pool_tvls < 100_000).sum())
                 
-                report += f"""
+                buf.write(f"""
 
 ### ⚠️ Risk Indicators
 - **TVL Concentration (Top Pool):** {self.format_percentage(concentration)}
-- **Pools with TVL < $100k:** {len(tvl_snapshot[tvl_snapshot['current_tvl_total'] < 100000])}
-"""
+- **Pools with TVL < $100k:** {small_pools}
+""")
         
-        report += """
+        buf.write("""
 
 ---
 
@@ -305,35 +479,78 @@ class ReportGenerator:
 
 ---
 *This report is automatically generated. For questions, contact the data team.*
-"""
+""")
         
-        return report
+        return buf.getvalue()
     
-    def generate_bridge_report(self, metrics: Dict[str, Any], bridge_df: pd.DataFrame):
-        """Generate markdown report for bridge data."""
-
-        summary = metrics['summary_overall'].iloc[0]
-        current_date = bridge_df['date'].max()
-
-        # Calculate deposit/withdrawal metrics for each timeframe
-        timeframes = {
-            '24h': bridge_df[bridge_df['date'] == current_date],
-            '7d': bridge_df[bridge_df['date'] >= current_date - timedelta(days=7)],
-            '30d': bridge_df[bridge_df['date'] >= current_date - timedelta(days=30)],
-            'All-time': bridge_df
+    def generate_bridge_report(self, metrics: Dict[str, Any], bridge_df: pd.DataFrame, generated_at: Optional[str] = None):
+        """Generate markdown report for bridge data, written section by section into one buffer."""
+        buf = io.StringIO()
+        generated_at = generated_at or datetime.now(timezone.utc).strftime(REPORT_TIMESTAMP_FORMAT)
+
+        # Pull the single-row summary/health frames into plain dicts once
+        summary = metrics['summary_overall'].to_dict('records')[0]
+        health = metrics['health_metrics'].to_dict('records')[0]
+
+        # Materialize dates as datetime64[ns] once (handles both Timestamp and date objects)
+        dates = bridge_df['date'].to_numpy('datetime64[ns]')
+        current_date = dates.max()
+
+        # Bucket every transaction by days before the latest date and build the
+        # (day offset x type) count/sum table in a single bincount pass
+        day = np.timedelta64(1, 'D')
+        days_ago = (current_date - dates) // day
+        # categorical codes give int8 0 = deposit, 1 = withdrawal, -1 = anything else
+        type_codes = pd.Categorical(bridge_df['type'], categories=['deposit', 'withdrawal']).codes
+        daily_counts, daily_sums = self._daily_flow_table(
+            days_ago, type_codes, bridge_df['amount_usd'].to_numpy()
+        )
+
+        # Day-offset slices for each timeframe
+        period_windows = {
+            '24h': slice(0, 1),
+            '7d': slice(0, 8),
+            '30d': slice(0, 31),
+            'All-time': slice(0, None)
         }
 
-        # Calculate previous period metrics for % change
-        prev_timeframes = {
-            '24h': bridge_df[bridge_df['date'] == current_date - timedelta(days=1)],
-            '7d': bridge_df[(bridge_df['date'] >= current_date - timedelta(days=14)) &
-                           (bridge_df['date'] < current_date - timedelta(days=7))],
-            '30d': bridge_df[(bridge_df['date'] >= current_date - timedelta(days=60)) &
-                            (bridge_df['date'] < current_date - timedelta(days=30))]
+        # Slices for the previous period, used for % change
+        prev_period_windows = {
+            '24h': slice(1, 2),
+            '7d': slice(8, 15),
+            '30d': slice(31, 61)
         }
 
-        report = f"""# 🌉 Bridge Analytics Report
-*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}*
+        # Deposit/withdrawal totals per period (rows follow period_windows order)
+        period_counts = np.stack([daily_counts[window].sum(axis=0) for window in period_windows.values()])
+        period_amounts = np.stack([daily_sums[window].sum(axis=0) for window in period_windows.values()])
+        prev_amounts = np.stack([daily_sums[window].sum(axis=0) for window in prev_period_windows.values()])
+
+        # Add net flow as a third amount column, then compute the % change of every
+        # flow type against its previous period in one vectorized step
+        period_amounts = np.column_stack([period_amounts, period_amounts[:, 0] - period_amounts[:, 1]])
+        prev_amounts = np.column_stack([prev_amounts, prev_amounts[:, 0] - prev_amounts[:, 1]])
+        pct_changes = self._pct_changes(period_amounts[:len(prev_amounts)], prev_amounts)
+
+        period_stats = {}
+        for i, period_name in enumerate(period_windows):
+            deposit_count, withdrawal_count = (int(count) for count in period_counts[i])
+            deposit_amount, withdrawal_amount, net_amount = period_amounts[i]
+            deposit_pct, withdrawal_pct, net_pct = pct_changes[i] if i < len(pct_changes) else ("", "", "")
+            period_stats[period_name] = {
+                'deposit_count': deposit_count,
+                'deposit_amount': deposit_amount,
+                'deposit_pct_change': deposit_pct,
+                'withdrawal_count': withdrawal_count,
+                'withdrawal_amount': withdrawal_amount,
+                'withdrawal_pct_change': withdrawal_pct,
+                'net_count': deposit_count - withdrawal_count,
+                'net_amount': net_amount,
+                'net_pct_change': net_pct
+            }
+
+        buf.write(f"""# 🌉 Bridge Analytics Report
+*Generated: {generated_at}*
 
 ---
 
@@ -350,102 +567,76 @@ class ReportGenerator:
 ---
 
 ## 📥 Deposits
-
-| Period | Count | Amount | % Change |
-|--------|-------|--------|----------|
-"""
+""")
+        buf.write(_BRIDGE_PERIOD_HEADER)
 
         # Add deposits data
-        for period_name, period_data in timeframes.items():
-            deposits = period_data[period_data['type'] == 'deposit']
-            deposit_count = len(deposits)
-            deposit_amount_usd = deposits['amount_usd'].sum()
-
-            pct_change_str = ""
-            if period_name in prev_timeframes:
-                prev_deposits = prev_timeframes[period_name][prev_timeframes[period_name]['type'] == 'deposit']
-                prev_amount = prev_deposits['amount_usd'].sum()
-                if prev_amount > 0:
-                    pct_change = ((deposit_amount_usd - prev_amount) / prev_amount) * 100
-                    pct_change_str = f"{pct_change:+.1f}%"
-                else:
-                    pct_change_str = "N/A"
-
-            report += f"| **{period_name}** | {deposit_count:,} | {self.format_number(deposit_amount_usd)} | {pct_change_str} |\n"
-
-        report += """
+        for period_name, stats in period_stats.items():
+            buf.write(_BRIDGE_PERIOD_ROW.format_map({
+                'period': period_name,
+                'count': stats['deposit_count'],
+                'amount': self.format_number(stats['deposit_amount']),
+                'pct': stats['deposit_pct_change']
+            }))
+
+        buf.write("""
 ---
 
 ## 📤 Withdrawals
-
-| Period | Count | Amount | % Change |
-|--------|-------|--------|----------|
-"""
+""")
+        buf.write(_BRIDGE_PERIOD_HEADER)
 
         # Add withdrawals data
-        for period_name, period_data in timeframes.items():
-            withdrawals = period_data[period_data['type'] == 'withdrawal']
-            withdrawal_count = len(withdrawals)
-            withdrawal_amount_usd = withdrawals['amount_usd'].sum()
-
-            pct_change_str = ""
-            if period_name in prev_timeframes:
-                prev_withdrawals = prev_timeframes[period_name][prev_timeframes[period_name]['type'] == 'withdrawal']
-                prev_amount = prev_withdrawals['amount_usd'].sum()
-                if prev_amount > 0:
-                    pct_change = ((withdrawal_amount_usd - prev_amount) / prev_amount) * 100
-                    pct_change_str = f"{pct_change:+.1f}%"
-                else:
-                    pct_change_str = "N/A"
-
-            report += f"| **{period_name}** | {withdrawal_count:,} | {self.format_number(withdrawal_amount_usd)} | {pct_change_str} |\n"
-
-        report += """
+        for period_name, stats in period_stats.items():
+            buf.write(_BRIDGE_PERIOD_ROW.format_map({
+                'period': period_name,
+                'count': stats['withdrawal_count'],
+                'amount': self.format_number(stats['withdrawal_amount']),
+                'pct': stats['withdrawal_pct_change']
+            }))
+
+        buf.write("""
 ---
 
 ## 💱 Net Flow
-
-| Period | Net Count | Net Amount | % Change |
-|--------|-----------|------------|----------|
-"""
+""")
+        buf.write(_BRIDGE_NET_HEADER)
 
         # Add net flow data
-        for period_name, period_data in timeframes.items():
-            deposits = period_data[period_data['type'] == 'deposit']
-            withdrawals = period_data[period_data['type'] == 'withdrawal']
-            net_count = len(deposits) - len(withdrawals)
-            net_amount = deposits['amount_usd'].sum() - withdrawals['amount_usd'].sum()
-
-            pct_change_str = ""
-            if period_name in prev_timeframes:
-                prev_deposits = prev_timeframes[period_name][prev_timeframes[period_name]['type'] == 'deposit']
-                prev_withdrawals = prev_timeframes[period_name][prev_timeframes[period_name]['type'] == 'withdrawal']
-                prev_net_amount = prev_deposits['amount_usd'].sum() - prev_withdrawals['amount_usd'].sum()
-                if abs(prev_net_amount) > 0:
-                    pct_change = ((net_amount - prev_net_amount) / abs(prev_net_amount)) * 100
-                    pct_change_str = f"{pct_change:+.1f}%"
-                else:
-                    pct_change_str = "N/A"
-
-            report += f"| **{period_name}** | {net_count:,} | {self.format_number(net_amount)} | {pct_change_str} |\n"
+        for period_name, stats in period_stats.items():
+            buf.write(_BRIDGE_PERIOD_ROW.format_map({
+                'period': period_name,
+                'count': stats['net_count'],
+                'amount': self.format_number(stats['net_amount']),
+                'pct': stats['net_pct_change']
+            }))
 
         # Add top tokens section
-        report += """
+        top_tokens = metrics['summary_by_token'].head(5)
+        if not top_tokens.empty:
+            buf.write("""
 ---
 
 ## 🪙 Top Tokens by Volume
-
-| Token | Total Volume | Share | Net Flow |
-|-------|--------------|-------|----------|
-"""
-
-        top_tokens = metrics['summary_by_token'].head(5)
-        for _, row in top_tokens.iterrows():
-            report += f"| **{row['token']}** | {self.format_number(row['total_volume'])} | {row['volume_share_pct']:.1f}% | {self.format_number(row['net_flow'])} |\n"
+""")
+            buf.write(_BRIDGE_TOKEN_HEADER)
+            buf.writelines([
+                _BRIDGE_TOKEN_ROW.format_map({
+                    'token': token,
+                    'volume': self.format_number(volume),
+                    'share': share,
+                    'net_flow': self.format_number(net_flow)
+                })
+                for token, volume, share, net_flow in zip(
+                    top_tokens['token'].to_numpy(),
+                    top_tokens['total_volume'].to_numpy(),
+                    top_tokens['volume_share_pct'].to_numpy(),
+                    top_tokens['net_flow'].to_numpy()
+                )
+            ])
 
         # Add health indicators
-        health = metrics['health_metrics'].iloc[0]
-        report += f"""
+        buf.write(f"""
 ---
 
 ## 🏥 Health Status: {health['risk_level']} (Score: {int(health['risk_score'])}/6)
@@ -468,34 +659,36 @@ class ReportGenerator:
 
 ---
 *This report is automatically generated. For questions, contact the data team.*
-"""
+""")
 
-        return report
+        return buf.getvalue()
 
-    def generate_summary_report(self, all_metrics: Dict[str, Any]):
-        """Generate a combined summary report for all protocols."""
+    def generate_summary_report(self, all_metrics: Dict[str, Any], generated_at: Optional[str] = None):
+        """Generate a combined summary report for all protocols, written section by section into one buffer."""
+        buf = io.StringIO()
+        generated_at = generated_at or datetime.now(timezone.utc).strftime(REPORT_TIMESTAMP_FORMAT)
 
-        report = f"""# 📊 Mezo Protocol Analytics - Daily Summary
-*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}*
+        buf.write(f"""# 📊 Mezo Protocol Analytics - Daily Summary
+*Generated: {generated_at}*
 
 ---
 
 ## 🎯 Protocol Overview
 
-"""
+""")
         
         # Add pools section if data exists
         if 'pools' in all_metrics:
             pools_data = all_metrics['pools']
-            report += f"""
+            buf.write(f"""
 ### 🏊 Liquidity Pools
 - **Total TVL:** {self.format_number(pools_data.get('total_tvl', 0))}
 - **Active Pools:** {pools_data.get('active_pools', 0)}
 - **24h Volume:** {self.format_number(0)}  # Add when volume data available
-"""
+""")
         
         # Placeholder for future protocol sections
-        report += """
+        buf.write("""
 
 ### 🌉 Bridge (Coming Soon)
 - Data pipeline in development
@@ -509,9 +702,9 @@ class ReportGenerator:
 ---
 
 *Full protocol coverage coming soon. Individual protocol reports available separately.*
-"""
+""")
         
-        return report
+        return buf.getvalue()
 
 # ==================================================
 # MAIN EXECUTION
@@ -524,6 +717,12 @@ class ReportGenerator:
 #     print("📊 MEZO ANALYTICS - REPORT GENERATION")
 #     print("=" * 60)
     
+#     # Format the run timestamp once so every report and file name agrees
+#     now = datetime.now(timezone.utc)
+#     generated_at = now.strftime(REPORT_TIMESTAMP_FORMAT)
+#     report_date = now.strftime('%Y-%m-%d')
+#     file_date = now.strftime('%Y%m%d')
+    
 #     try:
 #         # Load environment variables
 #         load_dotenv(dotenv_path='../.env', override=True)
@@ -561,10 +760,10 @@ class ReportGenerator:
 #                 print(f"   - Active Pools: {pools_results.get('active_pools', 0)}")
                 
 #                 # Generate pools report
-#                 pools_report = generator.generate_pools_report(pools_results)
+#                 pools_report = generator.generate_pools_report(pools_results, generated_at=generated_at)
                 
 #                 # Upload to Linear
-#                 doc_title = f"Pools Analytics Report - {datetime.now().strftime('%Y-%m-%d')}"
+#                 doc_title = f"Pools Analytics Report - {report_date}"
                 
 #                 # Check if we should update existing doc or create new
 #                 existing_doc_id = LINEAR_DOC_ID
@@ -590,7 +789,7 @@ class ReportGenerator:
 #                     print(f"   (Add LINEAR_DOC_ID={doc.get('id')} to .env to update this doc next time)")
                 
 #                 # Save report locally as backup
-#                 with open(f"reports/pools_report_{datetime.now().strftime('%Y%m%d')}.md", "w") as f:
+#                 with open(f"reports/pools_report_{file_date}.md", "w") as f:
 #                     f.write(pools_report)
 #                 print("✅ Report saved locally to reports/ directory")
                 
@@ -610,10 +809,10 @@ class ReportGenerator:
 #         print("Generating summary report...")
 #         print("=" * 60)
         
-#         summary_report = generator.generate_summary_report(all_metrics)
+#         summary_report = generator.generate_summary_report(all_metrics, generated_at=generated_at)
         
 #         # Upload summary to Linear
-#         summary_title = f"Protocol Summary - {datetime.now().strftime('%Y-%m-%d')}"
+#         summary_title = f"Protocol Summary - {report_date}"
 #         existing_summary_id = LINEAR_SUMMARY_DOC_ID
         
 #         if existing_summary_id:
@@ -634,7 +833,7 @@ class ReportGenerator:
 #             print(f"   Document ID: {doc.get('id')}")
         
 #         # Save summary locally
-#         with open(f"reports/summary_report_{datetime.now().strftime('%Y%m%d')}.md", "w") as f:
+#         with open(f"reports/summary_report_{file_date}.md", "w") as f:
 #             f.write(summary_report)
         
 #         print("\n" + "=" * 60)
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict
 from dotenv import load_dotenv
@@ -19,7 +20,8 @@ from mezo.visual_utils import ProgressIndicators, ExceptionHandler, with_progres
 @with_progress("Converting tokens to USD")
 def add_usd_conversions(df, token_column, tokens_id_map, amount_columns=None):
     """
-    Add USD price conversions to any token data
+    Add USD price conversions to any token data.
+    The USD columns are added to ``df`` in place (no copy of the input is made).
     
     Args:
         df: DataFrame containing token data
@@ -28,7 +30,7 @@ def add_usd_conversions(df, token_column, tokens_id_map, amount_columns=None):
         amount_columns: List of amount columns to convert, or None for auto-detection
     
     Returns:
-        DataFrame with USD conversion columns added
+        The input DataFrame with USD conversion columns added
     """
     if token_column not in df.columns:
         raise ValueError(f"Column '{token_column}' not found in DataFrame")
@@ -38,26 +40,28 @@ def add_usd_conversions(df, token_column, tokens_id_map, amount_columns=None):
     if prices is None or prices.empty:
         raise ValueError("No token prices received from API")
     
-    token_usd_prices = prices.T.reset_index()
-    df_result = df.copy()
-    df_result['index'] = df_result[token_column].map(tokens_id_map)
-    
-    df_with_usd = pd.merge(df_result, token_usd_prices, how='left', on='index')
+    # Look up each token's price directly instead of merging the price table in
+    price_by_token = pd.Series({
+        token: prices.loc['usd', cg_id] if cg_id in prices.columns else np.nan
+        for token, cg_id in tokens_id_map.items()
+    }, dtype=float)
     
     # Set MUSD price to 1.0 (1:1 with USD)
-    df_with_usd.loc[df_with_usd[token_column] == 'MUSD', 'usd'] = 1.0
+    price_by_token['MUSD'] = 1.0
+    
+    usd = df[token_column].map(price_by_token).to_numpy(dtype=float)
     
     # Auto-detect amount columns if not provided
     if amount_columns is None:
         amount_columns = [col for col in df.columns if 'amount' in col.lower() and col != 'amount_usd']
+    amount_columns = [col for col in amount_columns if col in df.columns]
     
-    # Add USD conversion for each amount column
-    for col in amount_columns:
-        if col in df_with_usd.columns:
-            usd_col_name = f"{col}_usd" if not col.endswith('_usd') else col
-            df_with_usd[usd_col_name] = df_with_usd[col] * df_with_usd['usd']
+    # Convert every amount column in a single broadcast multiply
+    if amount_columns:
+        usd_col_names = [f"{col}_usd" if not col.endswith('_usd') else col for col in amount_columns]
+        df[usd_col_names] = df[amount_columns].to_numpy(dtype=float) * usd[:, None]
     
-    return df_with_usd
+    return df
 
 @with_progress("Cleaning bridge data")
 def clean_bridge_data(raw, sort_col, date_cols, currency_cols, asset_col, txn_type):
@@ -65,7 +69,9 @@ def clean_bridge_data(raw, sort_col, date_cols, currency_cols, asset_col, txn_ty
     if not ExceptionHandler.validate_dataframe(raw, "Raw bridge data", [sort_col]):
         raise ValueError("Invalid input data for cleaning")
     
-    df = raw.copy().sort_values(by=sort_col)
+    # sort_values already returns a new frame, so no separate copy of raw is needed;
+    # mergesort keeps same-timestamp rows in their original order
+    df = raw.sort_values(by=sort_col, kind='mergesort')
     df = replace_token_labels(df, TOKEN_MAP)
     df = format_datetimes(df, date_cols)
     df = format_currency_columns(df, currency_cols, asset_col)
@@ -89,22 +95,35 @@ def calculate_max_drawdown(series: pd.Series) -> float:
     """Calculate maximum percentage drawdown"""
     if len(series) == 0:
         return 0
-    running_max = series.expanding().max()
-    drawdown = (series - running_max) / running_max * 100
+    # Single pass over the raw values; fmax skips NaNs like expanding().max() does
+    values = series.to_numpy(dtype=np.float64)
+    running_max = np.fmax.accumulate(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = (values - running_max) / running_max * 100
+    drawdown = drawdown[~np.isnan(drawdown)]
+    if drawdown.size == 0:
+        return np.nan
     return abs(drawdown.min())
 
+def top_n_sum(values: np.ndarray, n: int = 10) -> float:
+    """Sum the n largest non-NaN values via partial selection rather than a full sort"""
+    values = values[~np.isnan(values)]
+    if values.size > n:
+        values = np.partition(values, -n)[-n:]
+    return values.sum()
+
 def calculate_consecutive_outflow_days(daily_df: pd.DataFrame) -> int:
     """Count consecutive days of net outflows"""
     if 'net_flow' not in daily_df.columns:
         return 0
     
-    consecutive = 0
-    for i in range(len(daily_df) - 1, -1, -1):
-        if daily_df['net_flow'].iloc[i] < 0:
-            consecutive += 1
-        else:
-            break
-    return consecutive
+    # Outflow flags from the latest day backwards; argmin stops at the first non-outflow
+    # day, and landing on an outflow means there was none (the whole history is the streak)
+    outflows = (daily_df['net_flow'].to_numpy() < 0)[::-1]
+    if outflows.size == 0:
+        return 0
+    streak = int(np.argmin(outflows))
+    return len(outflows) if outflows[streak] else streak
 
 # ==================================================
 # GET RAW BRIDGE DATA
@@ -114,18 +133,23 @@ def calculate_consecutive_outflow_days(daily_df: pd.DataFrame) -> int:
 load_dotenv(dotenv_path='../.env', override=True)
 pd.options.display.float_format = '{:.5f}'.format
 
-raw_deposits = SubgraphClient.get_subgraph_data(
-    SubgraphClient.MEZO_BRIDGE_SUBGRAPH,
-    BridgeQueries.GET_BRIDGE_TRANSACTIONS,
-    'assetsLockeds'
-)
-
-ProgressIndicators.print_step("Fetching raw bridge withdrawal data", "start")
-raw_withdrawals = SubgraphClient.get_subgraph_data(
-    SubgraphClient.MEZO_BRIDGE_OUT_SUBGRAPH,
-    BridgeQueries.GET_NATIVE_WITHDRAWALS,
-    'assetsUnlockeds'
-)
+# Deposits and withdrawals come from separate subgraphs, so fetch them concurrently
+ProgressIndicators.print_step("Fetching raw bridge deposit and withdrawal data", "start")
+with ThreadPoolExecutor(max_workers=2) as executor:
+    deposits_future = executor.submit(
+        SubgraphClient.get_subgraph_data,
+        SubgraphClient.MEZO_BRIDGE_SUBGRAPH,
+        BridgeQueries.GET_BRIDGE_TRANSACTIONS,
+        'assetsLockeds'
+    )
+    withdrawals_future = executor.submit(
+        SubgraphClient.get_subgraph_data,
+        SubgraphClient.MEZO_BRIDGE_OUT_SUBGRAPH,
+        BridgeQueries.GET_NATIVE_WITHDRAWALS,
+        'assetsUnlockeds'
+    )
+    raw_deposits = deposits_future.result()
+    raw_withdrawals = withdrawals_future.result()
 
 # ==================================================
 # LOAD + CLEAN BRIDGE DATA
@@ -183,10 +207,26 @@ withdrawals_clean = withdrawals_clean.rename(columns={'sender': 'withdrawer', 'r
 # COMBINE DEPOSIT AND WITHDRAWAL DATA
 # ==================================================
 
+# Store the low-cardinality label columns as categoricals with a shared dtype
+# so the concat keeps them categorical (much smaller, faster masks/groupbys)
+for col in ('token', 'type'):
+    shared = pd.api.types.union_categoricals(
+        [deposits_clean[col].astype('category'), withdrawals_clean[col].astype('category')]
+    ).categories
+    deposits_clean = deposits_clean.assign(**{col: pd.Categorical(deposits_clean[col], categories=shared)})
+    withdrawals_clean = withdrawals_clean.assign(**{col: pd.Categorical(withdrawals_clean[col], categories=shared)})
+withdrawals_clean = withdrawals_clean.assign(chain=withdrawals_clean['chain'].astype('category'))
+
 combined = pd.concat(
     [deposits_clean, withdrawals_clean], 
     ignore_index=True
-).fillna(0)
+)
+
+# Only the side-specific columns and the value columns can hold NaNs, so fill just those.
+# Deposits have no chain; add 0 as a category so it reads like the other filled values
+combined['chain'] = combined['chain'].cat.add_categories([0]).fillna(0)
+fill_cols = ['depositor', 'withdrawer', 'withdraw_recipient', 'amount', 'amount_usd']
+combined[fill_cols] = combined[fill_cols].fillna(0)
 
 combined = combined.sort_values('timestamp_').reset_index(drop=True)
 
@@ -194,28 +234,18 @@ combined = combined.sort_values('timestamp_').reset_index(drop=True)
 # CREATE BRIDGE VOLUME AND BRIDGE TVL DATAFRAMES
 # ==================================================
 
-# Calculate net amounts (deposits positive, withdrawals negative)
-combined['net_flow'] = np.where(
-    combined['type'] == 'deposit',
-    combined['amount_usd'],
-    -combined['amount_usd']
-)
-# Calculate absolute amounts for deposits/withdrawals tracking
-combined['deposit_amount_usd'] = np.where(
-    combined['type'] == 'deposit',
-    combined['amount_usd'],
-    0
-)
-
-combined['withdrawal_amount_usd'] = np.where(
-    combined['type'] == 'withdrawal',
-    combined['amount_usd'],
-    0
+# Split amounts into deposit/withdrawal legs from one deposit mask (rows are one or the
+# other, so the withdrawal leg is the remainder and volume is the amount itself)
+amount_usd = combined['amount_usd'].to_numpy()
+deposit_amount_usd = amount_usd * (combined['type'] == 'deposit').to_numpy()
+withdrawal_amount_usd = amount_usd - deposit_amount_usd
+combined = combined.assign(
+    net_flow=deposit_amount_usd - withdrawal_amount_usd,  # deposits positive, withdrawals negative
+    deposit_amount_usd=deposit_amount_usd,
+    withdrawal_amount_usd=withdrawal_amount_usd,
+    volume=amount_usd
 )
 
-combined['volume'] = combined['withdrawal_amount_usd'] + combined['deposit_amount_usd']
-combined['tvl'] = combined['net_flow'].cumsum()
-
 # ==================================================
 # CORE METRIC CALCULATIONS
 # ==================================================
@@ -231,8 +261,9 @@ def calculate_bridge_metrics(combined: pd.DataFrame):
         Dictionary containing all calculated metrics dataframes
     """
     
-    # Ensure timestamp is datetime
-    combined['timestamp_'] = pd.to_datetime(combined['timestamp_'])
+    # Ensure timestamp is datetime, skipping the parse when it already is
+    if not pd.api.types.is_datetime64_any_dtype(combined['timestamp_']):
+        combined['timestamp_'] = pd.to_datetime(combined['timestamp_'])
     combined['date'] = combined['timestamp_']
     
     # Calculate all metrics
@@ -298,7 +329,7 @@ def calculate_daily_metrics_overall(df: pd.DataFrame):
     })
     
     # Combine and calculate additional metrics
-    daily = pd.merge(deposits, withdrawals, left_index=True, right_index=True, how='outer').fillna(0)
+    daily = pd.concat([deposits, withdrawals], axis=1, sort=True).fillna(0)
     
     # Core flow metrics
     daily['total_volume'] = daily['deposit_volume'] + daily['withdrawal_volume']
@@ -335,7 +366,7 @@ def calculate_daily_metrics_by_token(df: pd.DataFrame) -> pd.DataFrame:
     """
     
     # Group by date and token
-    deposits_by_token = df[df['type'] == 'deposit'].groupby(['date', 'token']).agg({
+    deposits_by_token = df[df['type'] == 'deposit'].groupby(['date', 'token'], observed=True).agg({
         'amount_usd': 'sum',
         'amount': 'sum',
         'transactionHash_': 'count'
@@ -345,7 +376,7 @@ def calculate_daily_metrics_by_token(df: pd.DataFrame) -> pd.DataFrame:
         'transactionHash_': 'deposit_count'
     })
     
-    withdrawals_by_token = df[df['type'] == 'withdrawal'].groupby(['date', 'token']).agg({
+    withdrawals_by_token = df[df['type'] == 'withdrawal'].groupby(['date', 'token'], observed=True).agg({
         'amount_usd': 'sum',
         'amount': 'sum',
         'transactionHash_': 'count'
@@ -356,13 +387,8 @@ def calculate_daily_metrics_by_token(df: pd.DataFrame) -> pd.DataFrame:
     })
     
     # Combine
-    daily_by_token = pd.merge(
-        deposits_by_token, 
-        withdrawals_by_token, 
-        left_index=True, 
-        right_index=True, 
-        how='outer'
-    ).fillna(0)
+    # Side-by-side on the (date, token) index; sort so the per-token cumsums run in date order
+    daily_by_token = pd.concat([deposits_by_token, withdrawals_by_token], axis=1, sort=True).fillna(0)
     
     # Calculate metrics
     daily_by_token['net_flow_usd'] = daily_by_token['deposit_volume_usd'] - daily_by_token['withdrawal_volume_usd']
@@ -370,8 +396,9 @@ def calculate_daily_metrics_by_token(df: pd.DataFrame) -> pd.DataFrame:
     daily_by_token['total_volume_usd'] = daily_by_token['deposit_volume_usd'] + daily_by_token['withdrawal_volume_usd']
     
     # Calculate cumulative TVL by token
-    daily_by_token['tvl_usd'] = daily_by_token.groupby(level='token')['net_flow_usd'].cumsum()
-    daily_by_token['tvl_amount'] = daily_by_token.groupby(level='token')['net_flow_amount'].cumsum()
+    daily_by_token[['tvl_usd', 'tvl_amount']] = (
+        daily_by_token.groupby(level='token', observed=True)[['net_flow_usd', 'net_flow_amount']].cumsum()
+    )
     
     return daily_by_token.round(2)
 
@@ -494,7 +521,8 @@ def calculate_summary_metrics_overall(df: pd.DataFrame, daily_df: pd.DataFrame):
         # Growth rates
         'tvl_growth_7d_pct': calculate_growth_rate(daily_df['tvl'], 7),
         'tvl_growth_30d_pct': calculate_growth_rate(daily_df['tvl'], 30),
-        'volume_growth_7d_pct': calculate_growth_rate(daily_df['total_volume'].rolling(7).sum(), 7),
+        # Only the last two 7-day windows feed the growth rate, so roll over the 14-day tail
+        'volume_growth_7d_pct': calculate_growth_rate(daily_df['total_volume'].iloc[-14:].rolling(7).sum(), 7),
         
         # Other
         'days_since_launch': days_since_launch,
@@ -508,62 +536,78 @@ def calculate_summary_metrics_by_token(df: pd.DataFrame):
     Calculate summary metrics for each token
     """
     
-    # Separate deposits and withdrawals for each token
-    token_summary = []
+    # Per-(token, type) sums/counts/means in one groupby, with types spread into columns
+    by_type = df.groupby(['token', 'type'], observed=True).agg(
+        amount_usd=('amount_usd', 'sum'),
+        amount=('amount', 'sum'),
+        count=('transactionHash_', 'count'),
+        mean_usd=('amount_usd', 'mean'),
+        depositors=('depositor', 'nunique'),
+        withdrawers=('withdrawer', 'nunique')
+    ).unstack('type', fill_value=0)
+    by_type = by_type.reindex(
+        columns=pd.MultiIndex.from_product([by_type.columns.levels[0], ['deposit', 'withdrawal']]),
+        fill_value=0
+    )
     
-    for token in df['token'].unique():
-        if pd.isna(token) or token == 0:
-            continue
-            
-        token_data = df[df['token'] == token]
-        deposits = token_data[token_data['type'] == 'deposit']
-        withdrawals = token_data[token_data['type'] == 'withdrawal']
+    # Per-token totals; a user is the depositor on deposits and the withdrawer on withdrawals
+    is_deposit = df['type'] == 'deposit'
+    users = df['depositor'].where(is_deposit, df['withdrawer'].where(df['type'] == 'withdrawal'))
+    totals = df.assign(_user=users).groupby('token', observed=True).agg(
+        total_volume=('amount_usd', 'sum'),
+        total_transactions=('transactionHash_', 'count'),
+        avg_transaction_size=('amount_usd', 'mean'),
+        first_transaction=('timestamp_', 'min'),
+        last_transaction=('timestamp_', 'max'),
+        total_unique_users=('_user', 'nunique')
+    )
+    totals = totals[totals.index != 0]
+    by_type = by_type.reindex(totals.index, fill_value=0)
+    
+    tokens = totals.index.to_series().astype(object)
+    deposit_volume = by_type[('amount_usd', 'deposit')]
+    withdrawal_volume = by_type[('amount_usd', 'withdrawal')]
+    deposit_amount = by_type[('amount', 'deposit')]
+    withdrawal_amount = by_type[('amount', 'withdrawal')]
+    
+    summary_df = pd.DataFrame({
+        'token': tokens,
+        'token_type': tokens.map(lambda token: TOKEN_TYPE_MAP.get(token, 'unknown')),
         
-        # Calculate token type
-        token_type = TOKEN_TYPE_MAP.get(token, 'unknown')
+        # Volume metrics
+        'total_deposit_volume': deposit_volume,
+        'total_withdrawal_volume': withdrawal_volume,
+        'net_volume': deposit_volume - withdrawal_volume,
+        'total_volume': totals['total_volume'],
         
-        summary = {
-            'token': token,
-            'token_type': token_type,
-            
-            # Volume metrics
-            'total_deposit_volume': deposits['amount_usd'].sum(),
-            'total_withdrawal_volume': withdrawals['amount_usd'].sum(),
-            'net_volume': deposits['amount_usd'].sum() - withdrawals['amount_usd'].sum(),
-            'total_volume': token_data['amount_usd'].sum(),
-            
-            # Amount metrics (native units)
-            'total_deposit_amount': deposits['amount'].sum(),
-            'total_withdrawal_amount': withdrawals['amount'].sum(),
-            'net_amount': deposits['amount'].sum() - withdrawals['amount'].sum(),
-            
-            # Transaction counts
-            'deposit_count': len(deposits),
-            'withdrawal_count': len(withdrawals),
-            'total_transactions': len(token_data),
-            
-            # User metrics
-            'unique_depositors': deposits['depositor'].nunique(),
-            'unique_withdrawers': withdrawals['withdrawer'].nunique(),
-            'total_unique_users': pd.concat([deposits['depositor'], withdrawals['withdrawer']]).nunique(),
-            
-            # Average metrics
-            'avg_deposit_size': deposits['amount_usd'].mean() if len(deposits) > 0 else 0,
-            'avg_withdrawal_size': withdrawals['amount_usd'].mean() if len(withdrawals) > 0 else 0,
-            'avg_transaction_size': token_data['amount_usd'].mean(),
-            
-            # Time metrics
-            'first_transaction': token_data['timestamp_'].min(),
-            'last_transaction': token_data['timestamp_'].max(),
-            'days_active': (token_data['timestamp_'].max() - token_data['timestamp_'].min()).days,
-            
-            # Dominance
-            'volume_share_pct': (token_data['amount_usd'].sum() / df['amount_usd'].sum()) * 100
-        }
+        # Amount metrics (native units)
+        'total_deposit_amount': deposit_amount,
+        'total_withdrawal_amount': withdrawal_amount,
+        'net_amount': deposit_amount - withdrawal_amount,
         
-        token_summary.append(summary)
-    
-    summary_df = pd.DataFrame(token_summary)
+        # Transaction counts
+        'deposit_count': by_type[('count', 'deposit')],
+        'withdrawal_count': by_type[('count', 'withdrawal')],
+        'total_transactions': totals['total_transactions'],
+        
+        # User metrics
+        'unique_depositors': by_type[('depositors', 'deposit')],
+        'unique_withdrawers': by_type[('withdrawers', 'withdrawal')],
+        'total_unique_users': totals['total_unique_users'],
+        
+        # Average metrics
+        'avg_deposit_size': by_type[('mean_usd', 'deposit')],
+        'avg_withdrawal_size': by_type[('mean_usd', 'withdrawal')],
+        'avg_transaction_size': totals['avg_transaction_size'],
+        
+        # Time metrics
+        'first_transaction': totals['first_transaction'],
+        'last_transaction': totals['last_transaction'],
+        'days_active': (totals['last_transaction'] - totals['first_transaction']).dt.days,
+        
+        # Dominance
+        'volume_share_pct': (totals['total_volume'] / df['amount_usd'].sum()) * 100
+    }).reset_index(drop=True)
     
     # Sort by total volume
     summary_df = summary_df.sort_values('total_volume', ascending=False)
@@ -588,24 +632,43 @@ def calculate_user_metrics(df: pd.DataFrame):
     # Remove null users
     all_users = all_users[all_users['user'].notna()]
     
-    user_metrics = all_users.groupby('user').agg({
-        'amount_usd': ['sum', 'mean', 'count', 'max'],
-        'timestamp_': ['min', 'max'],
-        'type': lambda x: x.value_counts().to_dict()
-    })
+    # Hash the addresses to int codes once; both groupbys below key on the codes
+    user_codes, user_ids = pd.factorize(all_users['user'].to_numpy())
+    all_users = all_users.assign(uid=user_codes)
+    
+    user_metrics = all_users.groupby('uid', sort=False).agg(
+        total_volume=('amount_usd', 'sum'),
+        avg_transaction=('amount_usd', 'mean'),
+        transaction_count=('amount_usd', 'count'),
+        largest_transaction=('amount_usd', 'max'),
+        first_activity=('timestamp_', 'min'),
+        last_activity=('timestamp_', 'max')
+    )
     
-    user_metrics.columns = ['total_volume', 'avg_transaction', 'transaction_count', 
-                            'largest_transaction', 'first_activity', 'last_activity', 'activity_breakdown']
+    # Activity breakdown from one (user, type) size instead of a value_counts lambda per
+    # user; rebuilt as the {type: count} dict the int_bridge_user-metrics table stores
+    activity = all_users.groupby(['uid', 'type'], sort=False, observed=True).size().unstack('type', fill_value=0)
+    activity = activity.reindex(index=user_metrics.index, columns=['deposit', 'withdrawal'], fill_value=0)
+    user_metrics['activity_breakdown'] = [
+        dict(sorted(((t, int(c)) for t, c in zip(('deposit', 'withdrawal'), counts) if c), key=lambda kv: -kv[1]))
+        for counts in activity.to_numpy()
+    ]
+    user_metrics.index = pd.Index(user_ids[user_metrics.index], name='user')
     
     # Calculate additional metrics
     user_metrics['days_active'] = (user_metrics['last_activity'] - user_metrics['first_activity']).dt.days
     user_metrics['is_active_30d'] = user_metrics['last_activity'] >= (datetime.now() - timedelta(days=30))
     
     # User segments based on volume
-    user_metrics['segment'] = pd.cut(
-        user_metrics['total_volume'],
-        bins=[0, 1000, 10000, 100000, float('inf')],
-        labels=['Retail (<$1k)', 'Mid ($1k-10k)', 'Large ($10k-100k)', 'Whale (>$100k)']
+    # Fixed right-closed bins (0, 1k], (1k, 10k], (10k, 100k], (100k, inf): a binary search over
+    # the inner edges gives the bin code directly; non-positive/NaN volumes get no segment
+    volumes = user_metrics['total_volume'].to_numpy()
+    segment_codes = np.searchsorted([1000, 10000, 100000], volumes, side='left')
+    segment_codes[~(volumes > 0)] = -1
+    user_metrics['segment'] = pd.Categorical.from_codes(
+        segment_codes,
+        categories=['Retail (<$1k)', 'Mid ($1k-10k)', 'Large ($10k-100k)', 'Whale (>$100k)'],
+        ordered=True
     )
     
     return user_metrics
@@ -615,31 +678,42 @@ def calculate_user_metrics_by_token(df: pd.DataFrame):
     Calculate user metrics broken down by token
     """
     
-    user_token_metrics = []
+    by_token = df.groupby('token', sort=False, observed=True)
+    token_volume = by_token['amount_usd'].sum()
+    tokens = token_volume.index[token_volume.index != 0]  # first-seen order, NaN tokens dropped
     
-    for token in df['token'].unique():
-        if pd.isna(token) or token == 0:
-            continue
-            
-        token_data = df[df['token'] == token]
-        
-        # Combine users for this token
-        token_users = pd.concat([
-            token_data['depositor'],
-            token_data['withdrawer']
-        ]).dropna().unique()
-        
-        metrics = {
-            'token': token,
-            'unique_users': len(token_users),
-            'avg_user_volume': token_data.groupby('depositor')['amount_usd'].sum().mean(),
-            'median_user_volume': token_data.groupby('depositor')['amount_usd'].sum().median(),
-            'whale_concentration': token_data.nlargest(10, 'amount_usd')['amount_usd'].sum() / token_data['amount_usd'].sum() * 100
-        }
-        
-        user_token_metrics.append(metrics)
+    # Users seen on either side of each token (deposit and withdraw addresses stacked)
+    token_col = df['token'].to_numpy()
+    stacked = pd.DataFrame({
+        'token': np.concatenate([token_col, token_col]),
+        'user': np.concatenate([df['depositor'].to_numpy(), df['withdrawer'].to_numpy()])
+    })
+    unique_users = stacked.groupby('token', observed=True)['user'].nunique()
+    
+    # Volume per (token, depositor), then mean/median across each token's depositors
+    user_volume = df.groupby(['token', 'depositor'], observed=True)['amount_usd'].sum()
+    user_volume_stats = user_volume.groupby(level='token', observed=True).agg(['mean', 'median'])
+    
+    # Top-10 transactions per token: one descending sort, then the first ten rows of every
+    # token group (NaN amounts sort last, so they only fill groups with fewer than ten)
+    top_10_volume = (
+        df[['token', 'amount_usd']]
+        .sort_values('amount_usd', ascending=False)
+        .groupby('token', sort=False, observed=True)
+        .head(10)
+        .groupby('token', observed=True)['amount_usd']
+        .sum()
+    )
+    
+    user_token_metrics = pd.DataFrame({
+        'token': tokens,
+        'unique_users': unique_users.reindex(tokens, fill_value=0).to_numpy(),
+        'avg_user_volume': user_volume_stats['mean'].reindex(tokens).to_numpy(),
+        'median_user_volume': user_volume_stats['median'].reindex(tokens).to_numpy(),
+        'whale_concentration': (top_10_volume.reindex(tokens) / token_volume.reindex(tokens) * 100).to_numpy()
+    })
     
-    return pd.DataFrame(user_token_metrics).round(2)
+    return user_token_metrics.round(2)
 
 # ==================================================
 # HEALTH INDICATORS
@@ -664,7 +738,7 @@ def calculate_health_indicators(daily_df: pd.DataFrame, df: pd.DataFrame):
         # Concentration risk
         'largest_transaction': df['amount_usd'].max(),
         'largest_tx_pct_of_tvl': (df['amount_usd'].max() / daily_df['tvl'].iloc[-1]) * 100 if daily_df['tvl'].iloc[-1] > 0 else 0,
-        'whale_concentration_pct': df.nlargest(10, 'amount_usd')['amount_usd'].sum() / df['amount_usd'].sum() * 100,
+        'whale_concentration_pct': top_n_sum(df['amount_usd'].to_numpy(), 10) / df['amount_usd'].sum() * 100,
         
         # Activity health
         'daily_active_users_7d_avg': daily_df['total_unique_users'].iloc[-7:].mean() if len(daily_df) >= 7 else 0,
@@ -789,14 +863,17 @@ def display_summary(metrics: Dict[str, pd.DataFrame], df: pd.DataFrame):
 # EXPORT FUNCTIONS
 # ==================================================
 
-def export_to_csv(metrics: Dict[str, pd.DataFrame], prefix: str = "bridge_metrics"):
-    """Export all metrics to CSV files"""
+def export_to_csv(metrics: Dict[str, pd.DataFrame], prefix: str = "bridge_metrics", file_format: str = "csv"):
+    """Export all metrics to CSV files (file_format='parquet' for snappy-compressed Parquet)"""
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     for name, df in metrics.items():
-        filename = f"{prefix}_{name}_{timestamp}.csv"
-        df.to_csv(filename)
+        filename = f"{prefix}_{name}_{timestamp}.{file_format}"
+        if file_format == "csv":
+            df.to_csv(filename)
+        else:
+            df.to_parquet(filename, compression='snappy', engine='pyarrow')
         print(f"✅ Exported {name} to {filename}")
 
 # ==================================================
@@ -816,6 +893,6 @@ health = metrics['health_metrics']
 # Display summary
 display_summary(metrics, combined)
 
-export_to_csv(metrics)
+export_to_csv(metrics, file_format="parquet")
 
 datetime.now()
\ No newline at end of file
@@ -33,7 +33,10 @@ def created_merged_loans(df_new, df_all, musd: SubgraphClient):
             'transactionHash_': 'txn_hash',
         }
 
-    df = pd.merge(df_all, df_new, on='transactionHash_', how='inner')
+    # Join on a transactionHash_ index; suffixes match the previous merge's _x/_y names
+    df = df_all.set_index('transactionHash_').join(
+        df_new.set_index('transactionHash_'), how='inner', lsuffix='_x', rsuffix='_y'
+    ).reset_index()
     df = processor.keep_and_rename_columns(df, rename_map)
     processor.format_currency_columns(df, ['loan_amt', 'collateral', 'stake', 'interest'])
     
@@ -47,7 +50,9 @@ def get_edited_loans(df: pd.DataFrame, musd:SubgraphClient, supabase: SupabaseCl
     edited_loans = df.loc[df['operation'] == "2"]
     new_loans = df.loc[df['operation'] == "0"]
 
-    edited_loans_with_original_data = pd.merge(edited_loans, new_loans, on='borrower', how='left')
+    edited_loans_with_original_data = edited_loans.set_index('borrower').join(
+        new_loans.set_index('borrower'), how='left', lsuffix='_x', rsuffix='_y'
+    ).reset_index()
 
     processor = DataProcessor(
         columns_to_keep=['timestamp__x', 'borrower', 'principal_x', 'coll_x', 
@@ -87,7 +92,7 @@ def get_edited_loans(df: pd.DataFrame, musd:SubgraphClient, supabase: SupabaseCl
 def process_daily_borrows(df: pd.DataFrame, supabase: SupabaseClient, update_db: bool = True):
     daily_df = df.groupby(['date']).agg(
         borrows = ('count', 'sum'),
-        borrowers = ('borrower', lambda x: x.drop_duplicates().count()),
+        borrowers = ('borrower', 'nunique'),
         loan_amt =('loan_amt', 'sum'),
         collateral = ('collateral', 'sum'),
         stake = ('stake', 'sum'),
@@ -104,9 +109,8 @@ def process_daily_borrows(df: pd.DataFrame, supabase: SupabaseClient, update_db:
     daily_df['cumulative_borrower_growth'] = daily_df['cumulative_borrowers'].pct_change()
     
     # Handle missing and infinite values
-    growth_cols = ['cumulative_loan_growth', 'cumulative_borrow_growth', 'cumulative_borrowers']
-    daily_df[growth_cols].replace([float('inf'), -float('inf')], 0, inplace=True)
-    daily_df[growth_cols].fillna(0, inplace=True)
+    growth_cols = ['cumulative_loan_growth', 'cumulative_borrow_growth', 'cumulative_borrower_growth']
+    daily_df[growth_cols] = daily_df[growth_cols].replace([float('inf'), -float('inf')], 0).fillna(0)
 
     # Rolling Growth Averages
     long_window = 30
@@ -175,7 +179,7 @@ def process_borrow_bins(df: pd.DataFrame, supabase: SupabaseClient):
 
     df_binned = df.groupby(['bins']).agg(
             borrows = ('count', 'sum'),
-            borrowers = ('borrower', lambda x: x.drop_duplicates().count()),
+            borrowers = ('borrower', 'nunique'),
             loan_amt =('loan_amt', 'sum'),
             loan_average = ('loan_amt', 'mean'),
             collateral_amt = ('collateral', 'sum'),
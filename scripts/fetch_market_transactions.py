@@ -6,16 +6,34 @@ This script fetches transaction fees data from the
 MUSD Market smart contracts via the Mezo block explorer API.
 """
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 CONTRACTS = {
     "Store": "0xB6881e8b21a3cd6D23c4F90724E26e35BB8980bE",
     "Donations": "0x6aD9E8e5236C0E2cF6D755Bb7BE4eABCbC03f76d"
 }
 
+# One keep-alive session for every page of every contract, so pages after the first
+# reuse the pooled TCP/TLS connection instead of handshaking again
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        raise_on_status=False  # fall through to the status check in the page loop
+    )
+))
+
 MARKET_MAP = {
     'Brink': 'Brink',
     'SheFi': 'SheFi',
@@ -29,24 +47,68 @@ MARKET_MAP = {
 }
 
 
-def fetch_contract_transactions(contract_name: str, contract_address: str) -> List[Dict]:
+def transactions_to_df(items: List[Dict], contract_name: str, contract_address: str) -> pd.DataFrame:
+    """
+    Flatten raw explorer transaction items into the fee data columns
+    
+    Args:
+        items: Raw transaction items from the explorer API
+        contract_name: Human-readable name for the contract
+        contract_address: contract address
+        
+    Returns:
+        DataFrame with one row per transaction
+    """
+    # One C-level flatten of the nested fields; reindex so absent fields still yield columns
+    raw = pd.json_normalize(items, max_level=1).reindex(columns=[
+        'timestamp', 'method', 'fee.value', 'has_error_in_internal_txs',
+        'from.hash', 'to.hash', 'hash', 'block', 'decoded_input.parameters'
+    ])
+    first_param = raw['decoded_input.parameters'].astype(object).str[0]
+    
+    return pd.DataFrame({
+        'contract_name': contract_name,
+        'contract_address': contract_address,
+        'timestamp_': raw['timestamp'],
+        'method': raw['method'],
+        # Wei fee strings parsed in one pass into exact int64 (fees are far below 2**63 wei)
+        'fee_value': pd.to_numeric(raw['fee.value']).fillna(0).astype(np.int64),
+        'has_error': raw['has_error_in_internal_txs'].eq(True),
+        'from_address': raw['from.hash'],
+        'to_address': raw['to.hash'],
+        'transactionHash_': raw['hash'],
+        'block_number': raw['block'],
+        'param_0_name': first_param.str.get('name'),
+        'param_0_value': first_param.str.get('value').map(str, na_action='ignore'),
+    })
+
+def fetch_contract_transactions(
+    contract_name: str, contract_address: str, since: Optional[str] = None
+) -> pd.DataFrame:
     """
     Fetch transactions and fee data from the MUSD Market smart contracts
     
     Args:
         contract_name: Human-readable name for the contract
         contract_address: contract address
+        since: Optional ISO date; pagination stops once a page reaches transactions older than this
         
     Returns:
-        List of transaction dictionaries
+        DataFrame of the contract's transactions
     """
-    print(f"\n{'='*60}")
-    print(f"📡 Fetching transactions for {contract_name}")
-    print(f"📍 Contract: {contract_address}")
-    print(f"{'='*60}")
+    # Contracts are fetched on concurrent threads, so each multi-line block is printed in
+    # one call and per-page lines carry the contract name to keep the log readable
+    print(
+        f"\n{'='*60}\n"
+        f"📡 Fetching transactions for {contract_name}\n"
+        f"📍 Contract: {contract_address}\n"
+        f"{'='*60}"
+    )
     
     url = f"https://api.explorer.mezo.org/api/v2/addresses/{contract_address}/transactions"
-    all_transactions = []
+    cutoff = pd.Timestamp(since, tz='UTC') if since else None
+    page_dfs = []
+    total_count = 0
     seen_hashes = set()
     next_page_params = None
     page_count = 0
@@ -57,12 +119,12 @@ def fetch_contract_transactions(contract_name: str, contract_address: str) -> Li
         
         # Use cursor-based pagination
         if next_page_params:
-            response = requests.get(url, params=next_page_params)
+            response = SESSION.get(url, params=next_page_params)
         else:
-            response = requests.get(url)
+            response = SESSION.get(url)
         
         if response.status_code != 200:
-            print(f"❌ Error: {response.status_code}")
+            print(f"❌ Error fetching {contract_name}: {response.status_code}")
             break
         
         data = response.json()
@@ -72,44 +134,39 @@ def fetch_contract_transactions(contract_name: str, contract_address: str) -> Li
             print(f"No more transactions found for {contract_name}")
             break
         
-        print(f"Found {len(transactions)} transactions on page {page_count}")
+        print(f"Found {len(transactions)} transactions on page {page_count} for {contract_name}")
         
-        # Process each transaction
-        new_count = 0
+        # Process each transaction (bound methods hoisted out of the per-item loop)
+        new_transactions = []
+        add_seen = seen_hashes.add
+        append_new = new_transactions.append
         for tx in transactions:
             tx_hash = tx.get('hash')
             
-            # Skip duplicates (safety check)
-            if tx_hash in seen_hashes:
+            # Skip duplicates (safety check). Remember the raw 32-byte digest rather than
+            # the 66-char hex string, which roughly halves the memory held per hash
+            seen_key = tx_hash
+            if type(tx_hash) is str and len(tx_hash) == 66:
+                seen_key = bytes.fromhex(tx_hash[2:])
+            if seen_key in seen_hashes:
                 continue
             
-            seen_hashes.add(tx_hash)
-            new_count += 1
-            
-            tx_data = {
-                'contract_name': contract_name,
-                'contract_address': contract_address,
-                'timestamp_': tx.get('timestamp'),
-                'method': tx.get('method'),
-                'fee_value': int(tx.get('fee', {}).get('value', 0)) if tx.get('fee') else 0,
-                'has_error': tx.get('has_error_in_internal_txs', False),
-                'from_address': tx.get('from', {}).get('hash') if tx.get('from') else None,
-                'to_address': tx.get('to', {}).get('hash') if tx.get('to') else None,
-                'transactionHash_': tx_hash,
-                'block_number': tx.get('block'),
-            }
-
-            # Extract decoded input parameters if available
-            if tx.get('decoded_input') and tx.get('decoded_input').get('parameters'):
-                parameters = tx.get('decoded_input').get('parameters')
-                if len(parameters) > 0:
-                    first_param = parameters[0]
-                    tx_data['param_0_name'] = first_param.get('name')
-                    tx_data['param_0_value'] = str(first_param.get('value'))
-            
-            all_transactions.append(tx_data)
+            add_seen(seen_key)
+            append_new(tx)
+        
+        # Flatten each page as it arrives so only the compact columns outlive the raw JSON
+        if new_transactions:
+            page_dfs.append(transactions_to_df(new_transactions, contract_name, contract_address))
+        total_count += len(new_transactions)
+        
+        print(f"✅ Added {len(new_transactions)} new transactions for {contract_name}")
         
-        print(f"✅ Added {new_count} new transactions for {contract_name}")
+        # The explorer returns newest first, so once a page ends before the cutoff
+        # every later page would be older still
+        oldest_timestamp = transactions[-1].get('timestamp')
+        if cutoff is not None and oldest_timestamp and pd.Timestamp(oldest_timestamp) < cutoff:
+            print(f"📅 Reached transactions before {since} for {contract_name}")
+            break
         
         # Get next page cursor
         next_page_params = data.get("next_page_params")
@@ -122,11 +179,15 @@ def fetch_contract_transactions(contract_name: str, contract_address: str) -> Li
         time.sleep(0.1)
     
     # Contract summary
-    print(f"\n📊 {contract_name} Summary:")
-    print(f"  Total pages: {page_count}")
-    print(f"  Total transactions: {len(all_transactions)}")
+    print(
+        f"\n📊 {contract_name} Summary:\n"
+        f"  Total pages: {page_count}\n"
+        f"  Total transactions: {total_count}"
+    )
     
-    return all_transactions
+    if not page_dfs:
+        return transactions_to_df([], contract_name, contract_address)
+    return pd.concat(page_dfs, ignore_index=True)
 
 def process_market_data(transactions_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -138,22 +199,34 @@ def process_market_data(transactions_df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Processed DataFrame with market-specific columns
     """
+    # Filter to market calls first so the conversions below only touch the rows we keep;
+    # take() gathers the matching rows into a new frame once, with no follow-up .copy()
+    market_methods = ['orderWithPermit', 'donateWithPermit']
+    is_market = transactions_df['method'].isin(market_methods).to_numpy()
+    market_df = transactions_df.take(np.flatnonzero(is_market))
+    
     # Convert fee values from wei to ETH and format to avoid scientific notation
-    transactions_df['fee_value'] = (transactions_df['fee_value'] / 1e18).round(10)
+    market_df['fee_value'] = np.round(market_df['fee_value'].to_numpy(dtype=np.float64) / 1e18, 10)
     
-    # Convert timestamps to datetime and extract date
-    transactions_df['timestamp_'] = pd.to_datetime(transactions_df['timestamp_'])
-    transactions_df['date'] = transactions_df['timestamp_'].dt.date
+    # Explorer timestamps are ISO8601 UTC strings; naming the format keeps the parse on the
+    # vectorized path, and the date is a day-truncated datetime64 rather than date objects
+    market_df['timestamp_'] = pd.to_datetime(market_df['timestamp_'], utc=True, format='ISO8601', cache=True)
+    market_df['date'] = market_df['timestamp_'].values.astype('datetime64[D]')
     
-    market_methods = ['orderWithPermit', 'donateWithPermit']
-    market_df = transactions_df[transactions_df['method'].isin(market_methods)].copy()
-    market_df['market_item'] = market_df['param_0_value'].map(MARKET_MAP)
+    # Items map by renaming the categories of a MARKET_MAP-keyed categorical (unknown ids -> NaN)
+    market_df['market_item'] = pd.Categorical(
+        market_df['param_0_value'], categories=list(MARKET_MAP.keys())
+    ).rename_categories(MARKET_MAP)
     
-    # Add transaction type for clarity
-    market_df['transaction_type'] = market_df['method'].map({
-        'orderWithPermit': 'purchase',
-        'donateWithPermit': 'donation'
-    })
+    # Add transaction type for clarity (only the two market methods remain after the filter)
+    market_df['transaction_type'] = np.where(
+        market_df['method'].to_numpy() == 'orderWithPermit', 'purchase', 'donation'
+    )
+    
+    # Low-cardinality labels as categoricals: smaller frames, and the value_counts/nunique
+    # and contract filters downstream work on integer codes
+    for col in ('contract_name', 'method', 'market_item', 'transaction_type', 'param_0_name'):
+        market_df[col] = market_df[col].astype('category')
     
     return market_df
 
@@ -181,10 +254,13 @@ def generate_summary_statistics(transactions_df: pd.DataFrame) -> Dict:
     return stats
 
 
-def main() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+def main(since: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Main function to fetch and process market transaction data.
     
+    Args:
+        since: Optional ISO date; stop paginating each contract once it is older than this
+    
     Returns:
         Tuple of (combined_df, store_df, donations_df)
     """
@@ -194,27 +270,24 @@ def main() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     # Set pandas display options to avoid scientific notation
     pd.set_option('display.float_format', '{:.10f}'.format)
     
-    # Store all transactions from both contracts
-    all_transactions = []
+    # Each contract paginates with its own cursor, so fetch the contracts concurrently;
+    # map() keeps the results in CONTRACTS order
+    with ThreadPoolExecutor(max_workers=len(CONTRACTS)) as executor:
+        contract_dfs = list(executor.map(
+            fetch_contract_transactions,
+            CONTRACTS.keys(), CONTRACTS.values(), [since] * len(CONTRACTS)
+        ))
     
-    # Loop through both contracts
-    for contract_name, contract_address in CONTRACTS.items():
-        contract_transactions = fetch_contract_transactions(contract_name, contract_address)
-        all_transactions.extend(contract_transactions)
-        
-        # Add delay between contracts
-        if contract_name != list(CONTRACTS.keys())[-1]:
-            print(f"\n⏳ Waiting before fetching next contract...")
-            time.sleep(1)
+    # Store all transactions from both contracts
+    transactions_df = pd.concat(contract_dfs, ignore_index=True)
     
     # Create combined DataFrame
     print(f"\n{'='*60}")
     print(f"📊 COMBINED ANALYSIS")
     print(f"{'='*60}")
     
-    if all_transactions:
-        # Create and process main DataFrame
-        transactions_df = pd.DataFrame(all_transactions)
+    if not transactions_df.empty:
+        # Process main DataFrame
         transactions_df = process_market_data(transactions_df)
         
         # Sort by timestamp (most recent first)
@@ -1,4 +1,6 @@
 from datetime import date, timedelta
+import argparse
+import json
 import os
 
 from dotenv import load_dotenv
@@ -7,27 +9,69 @@ import pandas as pd
 from mezo.clients import BigQueryClient, SupabaseClient
 from mezo.visual_utils import ProgressIndicators, with_progress
 
+# Opt-in (--use-cache) daily snapshot of the accounts table, so re-runs on the same day
+# skip the fetch; it holds user PII, so it lives under the git-ignored .cache/ directory
+USERS_CACHE_DIR = './.cache/supabase'
+
+# Text columns of the accounts table that are filtered, sorted and compared downstream
+USER_STRING_COLUMNS = ['address', 'evm_address', 'auth_user_id', 'updated_at']
+
+# Columns kept in the staging table
+USER_COLUMNS = ['updated_at', 'address', 'evm_address', 'auth_user_id', 'has_modified_username', 'metadata']
+
+# Default start date for filtering users by last activity
+MAINNET_LAUNCH = '2025-05-28'
+
 # ==================================================
 # HELPER FUNCTIONS
 # ==================================================
 
 @with_progress("Cleaning raw user data")
-def clean_users(df, last_active=None):
-    df = df.sort_values(by='updated_at', ascending=False)
-    df = df.loc[df['auth_user_id'].notna()].reset_index()
-
-    if last_active is not None:
-        df = df[df['updated_at'] >= last_active].reset_index()
-        df['updated_at'] = pd.to_datetime(df['updated_at']).dt.date
-    
-    df = df[['updated_at', 'address', 'evm_address', 'auth_user_id', 'has_modified_username', 'metadata']]
+def clean_users(df, last_active=None, columns=USER_COLUMNS):
+    # One combined row filter, then sort only the surviving rows
+    keep = df['auth_user_id'].notna().to_numpy()
+    if last_active is None:
+        return df.loc[keep, columns].sort_values(by='updated_at', ascending=False).reset_index(drop=True)
+
+    # Parse the timestamps once; the cutoff and the sort then compare datetime64 values
+    updated_at = pd.to_datetime(df['updated_at'], utc=True, format='ISO8601')
+    keep &= (updated_at >= pd.Timestamp(last_active, tz='UTC')).to_numpy()
+
+    df = df.loc[keep, columns].assign(updated_at=updated_at[keep])
+    df = df.sort_values(by='updated_at', ascending=False).reset_index(drop=True)
+    df['updated_at'] = df['updated_at'].dt.date
     
     return df
 
 @with_progress("Fetching user data from accounts table in Supabase")
-def fetch_users(supabase):
+def fetch_users(supabase, use_cache=False):
+    cache_path = f'{USERS_CACHE_DIR}/accounts_{date.today()}.parquet'
+
+    if use_cache and os.path.exists(cache_path):
+        print(f"Loaded cached accounts snapshot: {cache_path}")
+        users = pd.read_parquet(cache_path)
+        if 'metadata' in users.columns:
+            users['metadata'] = users['metadata'].map(json.loads, na_action='ignore')
+        return users
+
     users = supabase.fetch_table_data('accounts')
 
+    # Hold the text columns in Arrow buffers instead of one Python str per cell;
+    # metadata stays as plain dicts since its shape varies from row to row
+    string_columns = [col for col in USER_STRING_COLUMNS if col in users.columns]
+    users = users.astype({col: "string[pyarrow]" for col in string_columns})
+
+    if use_cache and not users.empty:
+        os.makedirs(USERS_CACHE_DIR, exist_ok=True)
+        previous_day_path = f'{USERS_CACHE_DIR}/accounts_{date.today() - timedelta(days=1)}.parquet'
+        if os.path.exists(previous_day_path):
+            os.remove(previous_day_path)
+        # metadata varies in shape row to row, so it is stored as JSON text rather than a struct
+        snapshot = users
+        if 'metadata' in users.columns:
+            snapshot = users.assign(metadata=users['metadata'].map(json.dumps, na_action='ignore'))
+        snapshot.to_parquet(cache_path)
+
     return users
 
 @with_progress("Saving user data to csv")
@@ -56,7 +100,9 @@ def create_galxe_export(df, name):
     save_to_csv(df, name)
 
 def get_btc_users(users):
-    btc_users = users[users["address"].str.startswith("b", na=False)].reset_index()
+    # Already Arrow-backed from fetch_users (no-op cast), so the prefix check runs in C
+    is_btc = users["address"].astype("string[pyarrow]").str.startswith("b").fillna(False).to_numpy(dtype=bool)
+    btc_users = users[is_btc].reset_index()
 
     return btc_users
 
@@ -75,32 +121,45 @@ def print_summary(users, start):
 # RUN MAIN FUNCTION
 # ==================================================
 
-def main(skip_bigquery=False, test_mode=False):
+def main(skip_bigquery=False, test_mode=False, start=MAINNET_LAUNCH, export_galxe=True, use_cache=False):
     ProgressIndicators.print_header("📌 GET MEZO USER DATA")    
 
+    if test_mode:
+        print(f"\n{'🧪 TEST MODE ENABLED 🧪':^60}")
+        print(f"{'─' * 60}\n")
+
+    if skip_bigquery:
+        print(f"{'Skipping BigQuery uploads':^60}")
+        print(f"{'─' * 60}\n")
+
     # set up env and clients
     load_dotenv(dotenv_path='../.env', override=True)
     supabase = SupabaseClient(url='SUPABASE_URL_PROD', key='SUPABASE_KEY_PROD')    
-    bq = BigQueryClient(key='GOOGLE_CLOUD_KEY', project_id='mezo-portal-data')
-
-    # set start date for filtering users
-    start = '2025-05-28' # mainnet launch
+    if not skip_bigquery:
+        bq = BigQueryClient(key='GOOGLE_CLOUD_KEY', project_id='mezo-portal-data')
 
     # fetch raw data from supabase `accounts` table
-    users_raw = fetch_users(supabase)
-    create_galxe_export(users_raw, "users_raw")
+    users_raw = fetch_users(supabase, use_cache=use_cache)
+    if export_galxe and not test_mode:
+        create_galxe_export(users_raw, "users_raw")
 
     # clean the raw users data and create staging tables    
     users_stg = clean_users(users_raw, start)
-    save_to_csv(users_stg, 'users')
+    if not test_mode:
+        save_to_csv(users_stg, 'users')
 
     # bigquery data uploads
-    upload_to_bigquery(users_raw, 'supabase', 'raw_mezo_users', 'auth_user_id', bq)
-    upload_to_bigquery(users_stg, 'staging', 'mezo_users_stg', 'auth_user_id', bq)
+    if not skip_bigquery:
+        upload_to_bigquery(users_raw, 'supabase', 'raw_mezo_users', 'auth_user_id', bq)
+        upload_to_bigquery(users_stg, 'staging', 'mezo_users_stg', 'auth_user_id', bq)
 
     print_summary(users_raw, start)
     
     ProgressIndicators.print_header("🚀 PROCESSING COMPLETED SUCCESSFULLY 🚀")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fetch Mezo user data from Supabase")
+    parser.add_argument('--use-cache', action='store_true',
+                        help="reuse today's accounts snapshot from .cache/supabase instead of refetching")
+    args = parser.parse_args()
+    main(use_cache=args.use_cache)
\ No newline at end of file
@@ -32,7 +32,9 @@ def clean_bridge_data(raw, sort_col, date_cols, currency_cols, asset_col, txn_ty
     if not ExceptionHandler.validate_dataframe(raw, "Raw bridge data", [sort_col]):
         raise ValueError("Invalid input data for cleaning")
     
-    df = raw.copy().sort_values(by=sort_col)
+    # sort_values already returns a new frame, so no separate copy of raw is needed;
+    # mergesort keeps same-timestamp rows in their original order
+    df = raw.sort_values(by=sort_col, kind='mergesort')
     df = conversions.replace_token_addresses_with_symbols(df=df, token_column='token', token_map=TOKEN_MAP)
     df = format_datetimes(df, date_cols)
     df = conversions.format_token_decimals(df, currency_cols, asset_col)
@@ -58,23 +60,40 @@ def calculate_max_drawdown(series: pd.Series):
     """Calculate maximum percentage drawdown"""
     if len(series) == 0:
         return 0
-    running_max = series.expanding().max()
-    drawdown = (series - running_max) / running_max * 100
+    # Single pass over the raw values; fmax skips NaNs like expanding().max() does
+    values = series.to_numpy(dtype=np.float64)
+    running_max = np.fmax.accumulate(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = (values - running_max) / running_max * 100
+    drawdown = drawdown[~np.isnan(drawdown)]
+    if drawdown.size == 0:
+        return np.nan
     return abs(drawdown.min())
 
+def nunique_union(a: np.ndarray, b: np.ndarray):
+    """Count distinct non-null values across two arrays without building an indexed Series"""
+    return pd.unique(np.concatenate([a[~pd.isna(a)], b[~pd.isna(b)]])).size
+
+def top_n_sum(values: np.ndarray, n: int = 10):
+    """Sum the n largest non-NaN values via partial selection rather than a full sort"""
+    values = values[~np.isnan(values)]
+    if values.size > n:
+        values = np.partition(values, -n)[-n:]
+    return values.sum()
+
 @with_progress("Calculating consecutive outflow days")
 def calculate_consecutive_outflow_days(daily_df: pd.DataFrame):
     """Count consecutive days of net outflows"""
     if 'net_flow' not in daily_df.columns:
         return 0
     
-    consecutive = 0
-    for i in range(len(daily_df) - 1, -1, -1):
-        if daily_df['net_flow'].iloc[i] < 0:
-            consecutive += 1
-        else:
-            break
-    return consecutive
+    # Outflow flags from the latest day backwards; argmin stops at the first non-outflow
+    # day, and landing on an outflow means there was none (the whole history is the streak)
+    outflows = (daily_df['net_flow'].to_numpy() < 0)[::-1]
+    if outflows.size == 0:
+        return 0
+    streak = int(np.argmin(outflows))
+    return len(outflows) if outflows[streak] else streak
 
 # ==================================================
 # CORE METRIC CALCULATIONS
@@ -91,9 +110,12 @@ def calculate_bridge_metrics(combined: pd.DataFrame):
         Dictionary containing all calculated metrics dataframes
     """
     
-    # Ensure timestamp is datetime
-    combined['date'] = pd.to_datetime(combined['timestamp_'])
-    combined['timestamp_'] = pd.to_datetime(combined['timestamp_'])
+    # Ensure timestamp is datetime, parsing it at most once and sharing it as the date key
+    if not pd.api.types.is_datetime64_any_dtype(combined['timestamp_']):
+        combined['timestamp_'] = pd.to_datetime(combined['timestamp_'])
+    combined['date'] = combined['timestamp_']
+    # Categorical type: the deposit/withdrawal masks below compare 1-byte codes, not strings
+    combined['type'] = combined['type'].astype('category')
     
     print("📊 Calculating metrics")
     
@@ -128,39 +150,46 @@ def calculate_daily_metrics_overall(df: pd.DataFrame):
     Calculate daily aggregated metrics for all tokens combined
     """
     
-    # Separate deposits and withdrawals
-    deposits = df[df['type'] == 'deposit'].groupby('date').agg({
-        'amount_usd': 'sum',
-        'transactionHash_': 'count',
-        'depositor': 'nunique'
-    }).rename(columns={
-        'amount_usd': 'deposit_amount_usd',
-        'transactionHash_': 'deposit_count',
-        'depositor': 'unique_depositors'
-    })
+    # Aggregate deposits and withdrawals in one (date, type) groupby and spread the
+    # types into side-by-side columns; days with only one type get 0 for the other
+    by_type = df.groupby(['date', 'type'], observed=True).agg(
+        amount_usd=('amount_usd', 'sum'),
+        count=('transactionHash_', 'count'),
+        depositors=('depositor', 'nunique'),
+        withdrawers=('withdrawer', 'nunique')
+    ).unstack('type', fill_value=0)
+    by_type = by_type.reindex(
+        columns=pd.MultiIndex.from_product([by_type.columns.levels[0], ['deposit', 'withdrawal']]),
+        fill_value=0
+    )
     
-    withdrawals = df[df['type'] == 'withdrawal'].groupby('date').agg({
-        'amount_usd': 'sum',
-        'transactionHash_': 'count',
-        'withdrawer': 'nunique'
-    }).rename(columns={
-        'amount_usd': 'withdrawal_amount_usd',
-        'transactionHash_': 'withdrawal_count',
-        'withdrawer': 'unique_withdrawers'
+    daily = pd.DataFrame({
+        'deposit_amount_usd': by_type[('amount_usd', 'deposit')],
+        'deposit_count': by_type[('count', 'deposit')],
+        'unique_depositors': by_type[('depositors', 'deposit')],
+        'withdrawal_amount_usd': by_type[('amount_usd', 'withdrawal')],
+        'withdrawal_count': by_type[('count', 'withdrawal')],
+        'unique_withdrawers': by_type[('withdrawers', 'withdrawal')]
     })
-    
-    # Combine and calculate additional metrics
-    daily = pd.merge(deposits, withdrawals, left_index=True, right_index=True, how='outer').fillna(0)
+    # A side with a missing day came out of the old outer merge as float64; keep that schema
+    # for the appended marts tables (a side's count is only 0 where the type had no rows)
+    for side, unique_col in (('deposit', 'unique_depositors'), ('withdrawal', 'unique_withdrawers')):
+        side_cols = [f'{side}_amount_usd', f'{side}_count', unique_col]
+        if (daily[f'{side}_count'] == 0).any():
+            daily[side_cols] = daily[side_cols].astype(np.float64)
     
     # Core flow metrics
     daily['total_volume'] = daily['deposit_amount_usd'] + daily['withdrawal_amount_usd']
     daily['net_flow'] = daily['deposit_amount_usd'] - daily['withdrawal_amount_usd']
     daily['flow_ratio'] = daily['deposit_amount_usd'] / daily['withdrawal_amount_usd'].replace(0, np.nan)
     
-    # Moving averages (7-day and 30-day)
-    for col in ['deposit_amount_usd', 'withdrawal_amount_usd', 'net_flow', 'total_volume']:
-        daily[f'{col}_ma7'] = daily[col].rolling(window=7, min_periods=1).mean()
-        daily[f'{col}_ma30'] = daily[col].rolling(window=30, min_periods=1).mean()
+    # Moving averages (7-day and 30-day), one multi-column rolling pass per window
+    ma_cols = ['deposit_amount_usd', 'withdrawal_amount_usd', 'net_flow', 'total_volume']
+    ma7 = daily[ma_cols].rolling(window=7, min_periods=1).mean()
+    ma30 = daily[ma_cols].rolling(window=30, min_periods=1).mean()
+    for col in ma_cols:
+        daily[f'{col}_ma7'] = ma7[col]
+        daily[f'{col}_ma30'] = ma30[col]
     
     # Cumulative metrics
     daily['cumulative_deposits'] = daily['deposit_amount_usd'].cumsum()
@@ -189,7 +218,7 @@ def calculate_daily_metrics_by_token(df: pd.DataFrame):
     """
     
     # Group by date and token
-    deposits_by_token = df[df['type'] == 'deposit'].groupby(['date', 'token']).agg({
+    deposits_by_token = df[df['type'] == 'deposit'].groupby(['date', 'token'], sort=False, observed=True).agg({
         'amount_usd': 'sum',
         'amount': 'sum',
         'transactionHash_': 'count'
@@ -199,7 +228,7 @@ def calculate_daily_metrics_by_token(df: pd.DataFrame):
         'transactionHash_': 'deposit_count'
     })
     
-    withdrawals_by_token = df[df['type'] == 'withdrawal'].groupby(['date', 'token']).agg({
+    withdrawals_by_token = df[df['type'] == 'withdrawal'].groupby(['date', 'token'], sort=False, observed=True).agg({
         'amount_usd': 'sum',
         'amount': 'sum',
         'transactionHash_': 'count'
@@ -210,13 +239,8 @@ def calculate_daily_metrics_by_token(df: pd.DataFrame):
     })
     
     # Combine
-    daily_by_token = pd.merge(
-        deposits_by_token, 
-        withdrawals_by_token, 
-        left_index=True, 
-        right_index=True, 
-        how='outer'
-    ).fillna(0)
+    # Side-by-side on the (date, token) index; sort so the per-token cumsums run in date order
+    daily_by_token = pd.concat([deposits_by_token, withdrawals_by_token], axis=1, sort=True).fillna(0)
     
     # Calculate metrics
     daily_by_token['net_flow'] = daily_by_token['deposit_amount_usd'] - daily_by_token['withdrawal_amount_usd']
@@ -224,8 +248,9 @@ def calculate_daily_metrics_by_token(df: pd.DataFrame):
     daily_by_token['total_volume_usd'] = daily_by_token['deposit_amount_usd'] + daily_by_token['withdrawal_amount_usd']
     
     # Calculate cumulative TVL by token
-    daily_by_token['tvl'] = daily_by_token.groupby(level='token')['net_flow'].cumsum()
-    daily_by_token['tvl_native'] = daily_by_token.groupby(level='token')['net_flow_native'].cumsum()
+    daily_by_token[['tvl', 'tvl_native']] = (
+        daily_by_token.groupby(level='token', sort=False, observed=True)[['net_flow', 'net_flow_native']].cumsum()
+    )
     daily_by_token = daily_by_token.reset_index()
     daily_by_token['identifier'] = daily_by_token['date'].apply(str) + '_' + daily_by_token['token']
     
@@ -239,69 +264,96 @@ def calculate_summary_metrics_overall(df: pd.DataFrame, daily_df: pd.DataFrame):
     current_date = df['date'].max()
     days_since_launch = (current_date - df['date'].min()).days
     
-    # Get recent periods
-    last_24h = df[df['date'] == current_date]
-    last_7d = df[df['date'] >= current_date - timedelta(days=7)]
-    last_30d = df[df['date'] >= current_date - timedelta(days=30)]
+    # Sort the plain arrays by date once; every trailing period is then a tail slice whose
+    # start is found by binary search, instead of a full-length mask per period
+    dates = df['date'].to_numpy()
+    order = np.argsort(dates, kind='stable')
+    dates = dates[order]
+    amount_usd = df['amount_usd'].to_numpy()[order]
+    depositors = df['depositor'].to_numpy()[order]
+    withdrawers = df['withdrawer'].to_numpy()[order]
+    is_deposit = (df['type'] == 'deposit').to_numpy()[order]
+    is_withdrawal = (df['type'] == 'withdrawal').to_numpy()[order]
+    
+    start_24h = np.searchsorted(dates, current_date.to_datetime64())
+    start_7d = np.searchsorted(dates, (current_date - timedelta(days=7)).to_datetime64())
+    start_30d = np.searchsorted(dates, (current_date - timedelta(days=30)).to_datetime64())
+    
+    def period_volume(start, side=None):
+        amounts = amount_usd[start:]
+        return np.nansum(amounts if side is None else amounts[side[start:]])
+    
+    def period_users(start):
+        return nunique_union(depositors[start:], withdrawers[start:])
+    
+    def period_avg(start):
+        return np.nanmean(amount_usd[start:]) if start < dates.size else 0
+    
+    inflow_24h, outflow_24h = period_volume(start_24h, is_deposit), period_volume(start_24h, is_withdrawal)
+    inflow_7d, outflow_7d = period_volume(start_7d, is_deposit), period_volume(start_7d, is_withdrawal)
+    inflow_30d, outflow_30d = period_volume(start_30d, is_deposit), period_volume(start_30d, is_withdrawal)
+    
+    # All-time figures that several fields share, reduced once
+    total_volume = df['amount_usd'].sum()
+    current_tvl = daily_df['tvl'].iloc[-1]
+    tvl_ath = daily_df['tvl'].max()
 
     summary = pd.DataFrame([{
         # Current state
-        'current_tvl': daily_df['tvl'].iloc[-1],
-        'tvl_ath': daily_df['tvl'].max(),
+        'current_tvl': current_tvl,
+        'tvl_ath': tvl_ath,
         'tvl_ath_date': daily_df['tvl'].idxmax(),
-        'distance_from_ath_pct': ((daily_df['tvl'].iloc[-1] / daily_df['tvl'].max()) - 1) * 100,
+        'distance_from_ath_pct': ((current_tvl / tvl_ath) - 1) * 100,
         
         # Volume metrics
-        'volume_24h': last_24h['amount_usd'].sum(),
-        'volume_7d': last_7d['amount_usd'].sum(),
-        'volume_30d': last_30d['amount_usd'].sum(),
-        'total_volume_all_time': df['amount_usd'].sum(),
+        'volume_24h': period_volume(start_24h),
+        'volume_7d': period_volume(start_7d),
+        'volume_30d': period_volume(start_30d),
+        'total_volume_all_time': total_volume,
         
         # Transaction metrics
-        'transactions_24h': len(last_24h),
+        'transactions_24h': int(dates.size - start_24h),
         'deposits_24h': daily_df['deposit_count'].iloc[-1],
         'withdrawals_24h': daily_df['withdrawal_count'].iloc[-1],
 
-        'transactions_7d': len(last_7d),
-        'transactions_30d': len(last_30d),
+        'transactions_7d': int(dates.size - start_7d),
+        'transactions_30d': int(dates.size - start_30d),
 
         'total_deposits_all_time': daily_df['deposit_count'].sum(),
         'total_withdrawals_all_time': daily_df['withdrawal_count'].sum(),
         'total_transactions_all_time': len(df), 
         
         # User metrics
-        'unique_users_24h': pd.concat([last_24h['depositor'], last_24h['withdrawer']]).nunique(),
-        'unique_users_7d': pd.concat([last_7d['depositor'], last_7d['withdrawer']]).nunique(),
-        'unique_users_30d': pd.concat([last_30d['depositor'], last_30d['withdrawer']]).nunique(),
-        'total_unique_users_all_time': pd.concat([df['depositor'], df['withdrawer']]).nunique(),
+        'unique_users_24h': period_users(start_24h),
+        'unique_users_7d': period_users(start_7d),
+        'unique_users_30d': period_users(start_30d),
+        'total_unique_users_all_time': nunique_union(depositors, withdrawers),
         
         # Average metrics
-        'avg_transaction_size_24h': last_24h['amount_usd'].mean() if len(last_24h) > 0 else 0,
-        'avg_transaction_size_7d': last_7d['amount_usd'].mean() if len(last_7d) > 0 else 0,
+        'avg_transaction_size_24h': period_avg(start_24h),
+        'avg_transaction_size_7d': period_avg(start_7d),
         'avg_transaction_size_all_time': df['amount_usd'].mean(),
         
         # Flow metrics
-        'inflow_24h': last_24h[last_24h['type'] == 'deposit']['amount_usd'].sum(),
-        'outflow_24h': last_24h[last_24h['type'] == 'withdrawal']['amount_usd'].sum(),
-        'net_flow_24h': last_24h[last_24h['type'] == 'deposit']['amount_usd'].sum() - 
-                        last_24h[last_24h['type'] == 'withdrawal']['amount_usd'].sum(),
-
-        'inflow_7d': last_7d[last_7d['type'] == 'deposit']['amount_usd'].sum(),
-        'outflow_7d': last_7d[last_7d['type'] == 'withdrawal']['amount_usd'].sum(),
-        'net_flow_7d': last_7d[last_7d['type'] == 'deposit']['amount_usd'].sum() - 
-                    last_7d[last_7d['type'] == 'withdrawal']['amount_usd'].sum(),
-
-        'net_flow_30d': last_30d[last_30d['type'] == 'deposit']['amount_usd'].sum() - 
-                        last_30d[last_30d['type'] == 'withdrawal']['amount_usd'].sum(),
+        'inflow_24h': inflow_24h,
+        'outflow_24h': outflow_24h,
+        'net_flow_24h': inflow_24h - outflow_24h,
+
+        'inflow_7d': inflow_7d,
+        'outflow_7d': outflow_7d,
+        'net_flow_7d': inflow_7d - outflow_7d,
+
+        'net_flow_30d': inflow_30d - outflow_30d,
         
         # Growth rates
         'tvl_growth_7d_pct': calculate_growth_rate(daily_df['tvl'], 7),
         'tvl_growth_30d_pct': calculate_growth_rate(daily_df['tvl'], 30),
-        'volume_growth_7d_pct': calculate_growth_rate(daily_df['total_volume'].rolling(7).sum(), 7),
+        # Only the last two 7-day windows feed the growth rate, so roll over the 14-day tail
+        'volume_growth_7d_pct': calculate_growth_rate(daily_df['total_volume'].iloc[-14:].rolling(7).sum(), 7),
         
         # Other
         'days_since_launch': days_since_launch,
-        'avg_daily_volume': df['amount_usd'].sum() / days_since_launch,
+        'avg_daily_volume': total_volume / days_since_launch,
 
         # ID column for BigQuery
         'updated_on': date.today()
@@ -314,64 +366,78 @@ def calculate_summary_metrics_by_token(df: pd.DataFrame):
     Calculate summary metrics for each token
     """
     
-    # Separate deposits and withdrawals for each token
-    token_summary = []
+    # Per-(token, type) sums/counts/means in one groupby, with types spread into columns
+    by_type = df.groupby(['token', 'type'], sort=False, observed=True).agg(
+        amount_usd=('amount_usd', 'sum'),
+        amount=('amount', 'sum'),
+        count=('transactionHash_', 'count'),
+        mean_usd=('amount_usd', 'mean'),
+        depositors=('depositor', 'nunique'),
+        withdrawers=('withdrawer', 'nunique')
+    ).unstack('type', fill_value=0)
+    by_type = by_type.reindex(
+        columns=pd.MultiIndex.from_product([by_type.columns.levels[0], ['deposit', 'withdrawal']]),
+        fill_value=0
+    )
     
-    for token in df['token'].unique():
-        if pd.isna(token) or token == 0:
-            continue
-            
-        token_data = df[df['token'] == token]
-        deposits = token_data[token_data['type'] == 'deposit']
-        withdrawals = token_data[token_data['type'] == 'withdrawal']
+    # Per-token totals; a user is the depositor on deposits and the withdrawer on withdrawals
+    is_deposit = df['type'] == 'deposit'
+    users = df['depositor'].where(is_deposit, df['withdrawer'].where(df['type'] == 'withdrawal'))
+    totals = df.assign(_user=users).groupby('token', sort=False, observed=True).agg(
+        total_volume=('amount_usd', 'sum'),
+        total_transactions=('transactionHash_', 'count'),
+        avg_transaction_size=('amount_usd', 'mean'),
+        first_transaction=('timestamp_', 'min'),
+        last_transaction=('timestamp_', 'max'),
+        total_unique_users=('_user', 'nunique')
+    )
+    totals = totals[totals.index != 0]
+    by_type = by_type.reindex(totals.index, fill_value=0)
+    
+    tokens = totals.index.to_series()
+    deposits_usd = by_type[('amount_usd', 'deposit')]
+    withdrawals_usd = by_type[('amount_usd', 'withdrawal')]
+    deposits_native = by_type[('amount', 'deposit')]
+    withdrawals_native = by_type[('amount', 'withdrawal')]
+    
+    summary_df = pd.DataFrame({
+        'token': tokens,
+        'token_type': tokens.map(lambda token: TOKEN_TYPE_MAP.get(token, 'unknown')),
         
-        # Calculate token type
-        token_type = TOKEN_TYPE_MAP.get(token, 'unknown')
-
-        summary = {
-            'token': token,
-            'token_type': token_type,
-            
-            # Volume metrics
-            'total_deposits_usd': deposits['amount_usd'].sum(),
-            'total_withdrawals_usd': withdrawals['amount_usd'].sum(),
-            'net_flow': deposits['amount_usd'].sum() - withdrawals['amount_usd'].sum(),
-            'total_volume': token_data['amount_usd'].sum(),
-            # 'tvl': df.groupby(level='token')['net_flow'].cumsum(),
-
-            
-            # Amount metrics (native units)
-            'total_deposits_native': deposits['amount'].sum(),
-            'total_withdrawals_native': withdrawals['amount'].sum(),
-            'net_flow_native': deposits['amount'].sum() - withdrawals['amount'].sum(),
-            
-            # Transaction counts
-            'deposit_count': len(deposits),
-            'withdrawal_count': len(withdrawals),
-            'total_transactions': len(token_data),
-            
-            # User metrics
-            'unique_depositors': deposits['depositor'].nunique(),
-            'unique_withdrawers': withdrawals['withdrawer'].nunique(),
-            'total_unique_users': pd.concat([deposits['depositor'], withdrawals['withdrawer']]).nunique(),
-            
-            # Average metrics
-            'avg_deposit_size': deposits['amount_usd'].mean() if len(deposits) > 0 else 0,
-            'avg_withdrawal_size': withdrawals['amount_usd'].mean() if len(withdrawals) > 0 else 0,
-            'avg_transaction_size': token_data['amount_usd'].mean(),
-            
-            # Time metrics
-            'first_transaction': token_data['timestamp_'].min(),
-            'last_transaction': token_data['timestamp_'].max(),
-            'days_active': (token_data['timestamp_'].max() - token_data['timestamp_'].min()).days,
-            
-            # Dominance
-            'volume_share_pct': (token_data['amount_usd'].sum() / df['amount_usd'].sum()) * 100
-        }
+        # Volume metrics
+        'total_deposits_usd': deposits_usd,
+        'total_withdrawals_usd': withdrawals_usd,
+        'net_flow': deposits_usd - withdrawals_usd,
+        'total_volume': totals['total_volume'],
         
-        token_summary.append(summary)
-    
-    summary_df = pd.DataFrame(token_summary)
+        # Amount metrics (native units)
+        'total_deposits_native': deposits_native,
+        'total_withdrawals_native': withdrawals_native,
+        'net_flow_native': deposits_native - withdrawals_native,
+        
+        # Transaction counts
+        'deposit_count': by_type[('count', 'deposit')],
+        'withdrawal_count': by_type[('count', 'withdrawal')],
+        'total_transactions': totals['total_transactions'],
+        
+        # User metrics
+        'unique_depositors': by_type[('depositors', 'deposit')],
+        'unique_withdrawers': by_type[('withdrawers', 'withdrawal')],
+        'total_unique_users': totals['total_unique_users'],
+        
+        # Average metrics
+        'avg_deposit_size': by_type[('mean_usd', 'deposit')],
+        'avg_withdrawal_size': by_type[('mean_usd', 'withdrawal')],
+        'avg_transaction_size': totals['avg_transaction_size'],
+        
+        # Time metrics
+        'first_transaction': totals['first_transaction'],
+        'last_transaction': totals['last_transaction'],
+        'days_active': (totals['last_transaction'] - totals['first_transaction']).dt.days,
+        
+        # Dominance
+        'volume_share_pct': (totals['total_volume'] / df['amount_usd'].sum()) * 100
+    }).reset_index(drop=True)
     
     # Sort by total volume
     summary_df = summary_df.sort_values('total_volume', ascending=False)
@@ -393,24 +459,43 @@ def calculate_user_metrics(df: pd.DataFrame):
     # Remove null users
     all_users = all_users[all_users['user'].notna()]
     
-    user_metrics = all_users.groupby('user').agg({
-        'amount_usd': ['sum', 'mean', 'count', 'max'],
-        'timestamp_': ['min', 'max'],
-        'type': lambda x: x.value_counts().to_dict()
-    })
+    # Hash the addresses to int codes once; both groupbys below key on the codes
+    user_codes, user_ids = pd.factorize(all_users['user'].to_numpy())
+    all_users = all_users.assign(uid=user_codes)
+    
+    user_metrics = all_users.groupby('uid', sort=False).agg(
+        total_volume=('amount_usd', 'sum'),
+        avg_transaction=('amount_usd', 'mean'),
+        transaction_count=('amount_usd', 'count'),
+        largest_transaction=('amount_usd', 'max'),
+        first_activity=('timestamp_', 'min'),
+        last_activity=('timestamp_', 'max')
+    )
     
-    user_metrics.columns = ['total_volume', 'avg_transaction', 'transaction_count', 
-                            'largest_transaction', 'first_activity', 'last_activity', 'activity_breakdown']
+    # Activity breakdown from one (user, type) size instead of a value_counts lambda per
+    # user; rebuilt as the {type: count} dict the int_bridge_user-metrics table stores
+    activity = all_users.groupby(['uid', 'type'], sort=False, observed=True).size().unstack('type', fill_value=0)
+    activity = activity.reindex(index=user_metrics.index, columns=['deposit', 'withdrawal'], fill_value=0)
+    user_metrics['activity_breakdown'] = [
+        dict(sorted(((t, int(c)) for t, c in zip(('deposit', 'withdrawal'), counts) if c), key=lambda kv: -kv[1]))
+        for counts in activity.to_numpy()
+    ]
+    user_metrics.index = pd.Index(user_ids[user_metrics.index], name='user')
 
     # Calculate additional metrics
     user_metrics['days_active'] = (user_metrics['last_activity'] - user_metrics['first_activity']).dt.days
     user_metrics['is_active_30d'] = user_metrics['last_activity'] >= (datetime.now() - timedelta(days=30))
     
     # User segments based on volume
-    user_metrics['segment'] = pd.cut(
-        user_metrics['total_volume'],
-        bins=[0, 1000, 10000, 100000, float('inf')],
-        labels=['Retail (<$1k)', 'Mid ($1k-10k)', 'Large ($10k-100k)', 'Whale (>$100k)']
+    # Fixed right-closed bins (0, 1k], (1k, 10k], (10k, 100k], (100k, inf): a binary search over
+    # the inner edges gives the bin code directly; non-positive/NaN volumes get no segment
+    volumes = user_metrics['total_volume'].to_numpy()
+    segment_codes = np.searchsorted([1000, 10000, 100000], volumes, side='left')
+    segment_codes[~(volumes > 0)] = -1
+    user_metrics['segment'] = pd.Categorical.from_codes(
+        segment_codes,
+        categories=['Retail (<$1k)', 'Mid ($1k-10k)', 'Large ($10k-100k)', 'Whale (>$100k)'],
+        ordered=True
     )
     
     # Remove users with '0' value
@@ -427,31 +512,42 @@ def calculate_user_metrics_by_token(df: pd.DataFrame):
     Calculate user metrics broken down by token
     """
     
-    user_token_metrics = []
+    by_token = df.groupby('token', sort=False, observed=True)
+    token_volume = by_token['amount_usd'].sum()
+    tokens = token_volume.index[token_volume.index != 0]  # first-seen order, NaN tokens dropped
     
-    for token in df['token'].unique():
-        if pd.isna(token) or token == 0:
-            continue
-            
-        token_data = df[df['token'] == token]
-        
-        # Combine users for this token
-        token_users = pd.concat([
-            token_data['depositor'],
-            token_data['withdrawer']
-        ]).dropna().unique()
-        
-        metrics = {
-            'token': token,
-            'unique_users': len(token_users),
-            'avg_user_volume': token_data.groupby('depositor')['amount_usd'].sum().mean(),
-            'median_user_volume': token_data.groupby('depositor')['amount_usd'].sum().median(),
-            'whale_concentration': token_data.nlargest(10, 'amount_usd')['amount_usd'].sum() / token_data['amount_usd'].sum() * 100
-        }
-        
-        user_token_metrics.append(metrics)
+    # Users seen on either side of each token (deposit and withdraw addresses stacked)
+    token_col = df['token'].to_numpy()
+    stacked = pd.DataFrame({
+        'token': np.concatenate([token_col, token_col]),
+        'user': np.concatenate([df['depositor'].to_numpy(), df['withdrawer'].to_numpy()])
+    })
+    unique_users = stacked.groupby('token', sort=False, observed=True)['user'].nunique()
+    
+    # Volume per (token, depositor), then mean/median across each token's depositors
+    user_volume = df.groupby(['token', 'depositor'], sort=False, observed=True)['amount_usd'].sum()
+    user_volume_stats = user_volume.groupby(level='token', sort=False, observed=True).agg(['mean', 'median'])
     
-    return pd.DataFrame(user_token_metrics).round(2)
+    # Top-10 transactions per token: one descending sort, then the first ten rows of every
+    # token group (NaN amounts sort last, so they only fill groups with fewer than ten)
+    top_10_volume = (
+        df[['token', 'amount_usd']]
+        .sort_values('amount_usd', ascending=False)
+        .groupby('token', sort=False, observed=True)
+        .head(10)
+        .groupby('token', sort=False, observed=True)['amount_usd']
+        .sum()
+    )
+    
+    user_token_metrics = pd.DataFrame({
+        'token': tokens,
+        'unique_users': unique_users.reindex(tokens, fill_value=0).to_numpy(),
+        'avg_user_volume': user_volume_stats['mean'].reindex(tokens).to_numpy(),
+        'median_user_volume': user_volume_stats['median'].reindex(tokens).to_numpy(),
+        'whale_concentration': (top_10_volume.reindex(tokens) / token_volume.reindex(tokens) * 100).to_numpy()
+    })
+    
+    return user_token_metrics.round(2)
 
 # HEALTH INDICATORS
 def calculate_health_indicators(daily_df: pd.DataFrame, df: pd.DataFrame):
@@ -472,7 +568,7 @@ def calculate_health_indicators(daily_df: pd.DataFrame, df: pd.DataFrame):
         # Concentration risk
         'largest_transaction': df['amount_usd'].max(),
         'largest_tx_pct_of_tvl': (df['amount_usd'].max() / daily_df['tvl'].iloc[-1]) * 100 if daily_df['tvl'].iloc[-1] > 0 else 0,
-        'whale_concentration_pct': df.nlargest(10, 'amount_usd')['amount_usd'].sum() / df['amount_usd'].sum() * 100,
+        'whale_concentration_pct': top_n_sum(df['amount_usd'].to_numpy(), 10) / df['amount_usd'].sum() * 100,
         
         # Activity health
         'daily_active_users_7d_avg': daily_df['total_unique_users'].iloc[-7:].mean() if len(daily_df) >= 7 else 0,
@@ -507,17 +603,22 @@ def calculate_health_indicators(daily_df: pd.DataFrame, df: pd.DataFrame):
 # DISPLAY FUNCTIONS
 # ==================================================
 
-def display_summary(metrics: Dict[str, pd.DataFrame], df: pd.DataFrame):
-    """Display formatted summary of key metrics"""
+def display_summary(metrics: Dict[str, pd.DataFrame], df: pd.DataFrame, quiet: bool = False):
+    """Display formatted summary of key metrics (skipped entirely when quiet)"""
+    
+    if quiet:
+        return
     
-    print("\n" + "="*60)
-    print("📊 BRIDGE VOLUME METRICS SUMMARY")
-    print("="*60)
+    # Collect the summary lines and write them to stdout in one call at the end
+    lines = []
+    lines.append("\n" + "="*60)
+    lines.append("📊 BRIDGE VOLUME METRICS SUMMARY")
+    lines.append("="*60)
     
     # Overall summary
     summary = metrics['summary_overall'].iloc[0]
-    print(f"\n💰 TVL: ${summary['current_tvl']:,.0f} ({summary['tvl_growth_7d_pct']:+.1f}% 7d)")
-    print(f"💱 Net Flow (7d): ${summary['net_flow_7d']:,.0f}")
+    lines.append(f"\n💰 TVL: ${summary['current_tvl']:,.0f} ({summary['tvl_growth_7d_pct']:+.1f}% 7d)")
+    lines.append(f"💱 Net Flow (7d): ${summary['net_flow_7d']:,.0f}")
     
     # Calculate deposit/withdrawal metrics for each timeframe
     current_date = df['date'].max()
@@ -537,126 +638,124 @@ def display_summary(metrics: Dict[str, pd.DataFrame], df: pd.DataFrame):
         '30d': df[(df['date'] >= current_date - timedelta(days=60)) & (df['date'] < current_date - timedelta(days=30))]
     }
 
-    # Print deposit and withdrawal metrics
-    print("\n📥 DEPOSITS:")
-    print("-" * 80)
-    print(f"{'Period':<12} {'Count':>10} {'Amount':>20} {'% Change':>15}")
-    print("-" * 80)
+    # Filter and reduce each period once, then reuse the totals across all three tables
+    def period_totals(period_data):
+        deposits = period_data.loc[period_data['type'] == 'deposit', 'amount_usd']
+        withdrawals = period_data.loc[period_data['type'] == 'withdrawal', 'amount_usd']
+        dep_sum, wd_sum = deposits.sum(), withdrawals.sum()
+        return {
+            'dep_sum': dep_sum,
+            'dep_cnt': len(deposits),
+            'wd_sum': wd_sum,
+            'wd_cnt': len(withdrawals),
+            'net': dep_sum - wd_sum
+        }
+
+    def format_pct_change(current, previous):
+        if previous > 0:
+            return f"{((current - previous) / previous) * 100:+.1f}%"
+        return "N/A"
 
-    for period_name, period_data in timeframes.items():
-        deposits = period_data[period_data['type'] == 'deposit']
-        deposit_count = len(deposits)
-        deposit_amount_usd = deposits['amount_usd'].sum()
+    period_stats = {name: period_totals(data) for name, data in timeframes.items()}
+    prev_stats = {name: period_totals(data) for name, data in prev_timeframes.items()}
+
+    # Print deposit and withdrawal metrics
+    lines.append("\n📥 DEPOSITS:")
+    lines.append("-" * 80)
+    lines.append(f"{'Period':<12} {'Count':>10} {'Amount':>20} {'% Change':>15}")
+    lines.append("-" * 80)
 
+    for period_name, stats in period_stats.items():
         # Calculate % change (skip for All-time)
         pct_change_str = ""
-        if period_name in prev_timeframes:
-            prev_deposits = prev_timeframes[period_name][prev_timeframes[period_name]['type'] == 'deposit']
-            prev_amount = prev_deposits['amount_usd'].sum()
-            if prev_amount > 0:
-                pct_change = ((deposit_amount_usd - prev_amount) / prev_amount) * 100
-                pct_change_str = f"{pct_change:+.1f}%"
-            else:
-                pct_change_str = "N/A"
+        if period_name in prev_stats:
+            pct_change_str = format_pct_change(stats['dep_sum'], prev_stats[period_name]['dep_sum'])
 
-        print(f"{period_name:<12} {deposit_count:>10,} {'$':>15}{deposit_amount_usd:>1,.0f} {pct_change_str:>15}")
+        lines.append(f"{period_name:<12} {stats['dep_cnt']:>10,} {'$':>15}{stats['dep_sum']:>1,.0f} {pct_change_str:>15}")
     
-    print("\n📤 WITHDRAWALS:")
-    print("-" * 80)
-    print(f"{'Period':<12} {'Count':>10} {'Amount':>20} {'% Change':>15}")
-    print("-" * 80)
-
-    for period_name, period_data in timeframes.items():
-        withdrawals = period_data[period_data['type'] == 'withdrawal']
-        withdrawal_count = len(withdrawals)
-        withdrawal_amount_usd = withdrawals['amount_usd'].sum()
+    lines.append("\n📤 WITHDRAWALS:")
+    lines.append("-" * 80)
+    lines.append(f"{'Period':<12} {'Count':>10} {'Amount':>20} {'% Change':>15}")
+    lines.append("-" * 80)
 
+    for period_name, stats in period_stats.items():
         # Calculate % change (skip for All-time)
         pct_change_str = ""
-        if period_name in prev_timeframes:
-            prev_withdrawals = prev_timeframes[period_name][prev_timeframes[period_name]['type'] == 'withdrawal']
-            prev_amount = prev_withdrawals['amount_usd'].sum()
-            if prev_amount > 0:
-                pct_change = ((withdrawal_amount_usd - prev_amount) / prev_amount) * 100
-                pct_change_str = f"{pct_change:+.1f}%"
-            else:
-                pct_change_str = "N/A"
+        if period_name in prev_stats:
+            pct_change_str = format_pct_change(stats['wd_sum'], prev_stats[period_name]['wd_sum'])
 
-        print(f"{period_name:<12} {withdrawal_count:>10,} {'$':>15}{withdrawal_amount_usd:>1,.0f} {pct_change_str:>15}")
+        lines.append(f"{period_name:<12} {stats['wd_cnt']:>10,} {'$':>15}{stats['wd_sum']:>1,.0f} {pct_change_str:>15}")
     
-    print("\n💱 NET FLOW:")
-    print("-" * 80)
-    print(f"{'Period':<12} {'Net Count':>10} {'Net Amount':>20} {'% Change':>15}")
-    print("-" * 80)
+    lines.append("\n💱 NET FLOW:")
+    lines.append("-" * 80)
+    lines.append(f"{'Period':<12} {'Net Count':>10} {'Net Amount':>20} {'% Change':>15}")
+    lines.append("-" * 80)
 
-    for period_name, period_data in timeframes.items():
-        deposits = period_data[period_data['type'] == 'deposit']
-        withdrawals = period_data[period_data['type'] == 'withdrawal']
-        net_count = len(deposits) - len(withdrawals)
-        net_amount = deposits['amount_usd'].sum() - withdrawals['amount_usd'].sum()
+    for period_name, stats in period_stats.items():
+        net_count = stats['dep_cnt'] - stats['wd_cnt']
 
-        # Calculate % change (skip for All-time)
+        # Calculate % change against the magnitude of the previous net flow (skip for All-time)
         pct_change_str = ""
-        if period_name in prev_timeframes:
-            prev_deposits = prev_timeframes[period_name][prev_timeframes[period_name]['type'] == 'deposit']
-            prev_withdrawals = prev_timeframes[period_name][prev_timeframes[period_name]['type'] == 'withdrawal']
-            prev_net_amount = prev_deposits['amount_usd'].sum() - prev_withdrawals['amount_usd'].sum()
+        if period_name in prev_stats:
+            prev_net_amount = prev_stats[period_name]['net']
             if abs(prev_net_amount) > 0:
-                pct_change = ((net_amount - prev_net_amount) / abs(prev_net_amount)) * 100
+                pct_change = ((stats['net'] - prev_net_amount) / abs(prev_net_amount)) * 100
                 pct_change_str = f"{pct_change:+.1f}%"
             else:
                 pct_change_str = "N/A"
 
-        print(f"{period_name:<12} {net_count:>10,} {'$':>11}{net_amount:>1,.0f} {pct_change_str:>15}")
+        lines.append(f"{period_name:<12} {net_count:>10,} {'$':>11}{stats['net']:>1,.0f} {pct_change_str:>15}")
     
     # Top tokens
-    print("\n🪙 TOP TOKENS BY VOLUME:")
-    print("-" * 50)
+    lines.append("\n🪙 TOP TOKENS BY VOLUME:")
+    lines.append("-" * 50)
     top_tokens = metrics['summary_by_token'].head(5)[['token', 'total_volume', 'volume_share_pct', 'net_flow']]
     for _, row in top_tokens.iterrows():
-        print(f"  {row['token']:<8} {'$':>4}{row['total_volume']:>1,.0f} - {row['volume_share_pct']:.1f}{'%':>2} {'|':>2} {'Net: $':<2}{row['net_flow']:,.0f}")
+        lines.append(f"  {row['token']:<8} {'$':>4}{row['total_volume']:>1,.0f} - {row['volume_share_pct']:.1f}{'%':>2} {'|':>2} {'Net: $':<2}{row['net_flow']:,.0f}")
     
     # User metrics with % change
-    print("\n👥 USER ACTIVITY:")
-    print("-" * 80)
-    print(f"  {'Period':<20} {'Active Users':>15} {'% Change':>15}")
-    print("-" * 80)
+    lines.append("\n👥 USER ACTIVITY:")
+    lines.append("-" * 80)
+    lines.append(f"  {'Period':<20} {'Active Users':>15} {'% Change':>15}")
+    lines.append("-" * 80)
 
     # Calculate user metrics for each period
+    # Previous periods reuse the frames sliced above; the user is the depositor where
+    # present and the withdrawer otherwise, coalesced column-wise instead of per row
+    def previous_users(period_data):
+        depositors = period_data['depositor']
+        return depositors.where(depositors.notna(), period_data['withdrawer']).nunique()
+
+    prev_24h = prev_timeframes['24h']
     user_metrics = {
         '24h': (summary['unique_users_24h'],
-                df[df['date'] == current_date - timedelta(days=1)]['depositor'].nunique() +
-                df[df['date'] == current_date - timedelta(days=1)]['withdrawer'].nunique()),
-        '7d': (summary['unique_users_7d'],
-               df[(df['date'] >= current_date - timedelta(days=14)) &
-                  (df['date'] < current_date - timedelta(days=7))].apply(
-                      lambda x: x['depositor'] if pd.notna(x.get('depositor')) else x.get('withdrawer'), axis=1).nunique()),
-        '30d': (summary['unique_users_30d'],
-                df[(df['date'] >= current_date - timedelta(days=60)) &
-                   (df['date'] < current_date - timedelta(days=30))].apply(
-                       lambda x: x['depositor'] if pd.notna(x.get('depositor')) else x.get('withdrawer'), axis=1).nunique())
+                prev_24h['depositor'].nunique() + prev_24h['withdrawer'].nunique()),
+        '7d': (summary['unique_users_7d'], previous_users(prev_timeframes['7d'])),
+        '30d': (summary['unique_users_30d'], previous_users(prev_timeframes['30d']))
     }
 
-    print(f"  {'24h Active Users':<20} {summary['unique_users_24h']:>15,.0f} {f'{((summary["unique_users_24h"] - user_metrics["24h"][1]) / user_metrics["24h"][1] * 100):+.1f}%' if user_metrics['24h'][1] > 0 else 'N/A':>15}")
-    print(f"  {'7d Active Users':<20} {summary['unique_users_7d']:>15,.0f} {f'{((summary["unique_users_7d"] - user_metrics["7d"][1]) / user_metrics["7d"][1] * 100):+.1f}%' if user_metrics['7d'][1] > 0 else 'N/A':>15}")
-    print(f"  {'30d Active Users':<20} {summary['unique_users_30d']:>15,.0f} {f'{((summary["unique_users_30d"] - user_metrics["30d"][1]) / user_metrics["30d"][1] * 100):+.1f}%' if user_metrics['30d'][1] > 0 else 'N/A':>15}")
-    print(f"  {'All-time Users':<20} {summary['total_unique_users_all_time']:>15,.0f} {'':<15}")
+    lines.append(f"  {'24h Active Users':<20} {summary['unique_users_24h']:>15,.0f} {f'{((summary["unique_users_24h"] - user_metrics["24h"][1]) / user_metrics["24h"][1] * 100):+.1f}%' if user_metrics['24h'][1] > 0 else 'N/A':>15}")
+    lines.append(f"  {'7d Active Users':<20} {summary['unique_users_7d']:>15,.0f} {f'{((summary["unique_users_7d"] - user_metrics["7d"][1]) / user_metrics["7d"][1] * 100):+.1f}%' if user_metrics['7d'][1] > 0 else 'N/A':>15}")
+    lines.append(f"  {'30d Active Users':<20} {summary['unique_users_30d']:>15,.0f} {f'{((summary["unique_users_30d"] - user_metrics["30d"][1]) / user_metrics["30d"][1] * 100):+.1f}%' if user_metrics['30d'][1] > 0 else 'N/A':>15}")
+    lines.append(f"  {'All-time Users':<20} {summary['total_unique_users_all_time']:>15,.0f} {'':<15}")
     
     # Health indicators
     health = metrics['health_metrics'].iloc[0]
-    print(f"\n🏥 HEALTH STATUS: {health['risk_level']} (Score: {health['risk_score']}/6)")
-    print("-" * 50)
-    print(f"  Volatility (30d):           {health['tvl_volatility_30d']:>6.1f}%")
-    print(f"  Max Drawdown (30d):         {health['max_drawdown_30d']:>6.1f}%")
-    print(f"  Consecutive Outflow Days:   {health['consecutive_outflow_days']:>6.0f}")
-    print(f"  Whale Concentration:        {health['whale_concentration_pct']:>6.1f}%")
-    print(f"  Outflow Ratio (7d):         {health['outflow_ratio_7d']:>6.2f}")
+    lines.append(f"\n🏥 HEALTH STATUS: {health['risk_level']} (Score: {health['risk_score']}/6)")
+    lines.append("-" * 50)
+    lines.append(f"  Volatility (30d):           {health['tvl_volatility_30d']:>6.1f}%")
+    lines.append(f"  Max Drawdown (30d):         {health['max_drawdown_30d']:>6.1f}%")
+    lines.append(f"  Consecutive Outflow Days:   {health['consecutive_outflow_days']:>6.0f}")
+    lines.append(f"  Whale Concentration:        {health['whale_concentration_pct']:>6.1f}%")
+    lines.append(f"  Outflow Ratio (7d):         {health['outflow_ratio_7d']:>6.2f}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 # ==================================================
 # RUN MAIN PROCESS
 # ==================================================
         
-def main(skip_bigquery=False, sample_size=False, test_mode=False):
+def main(skip_bigquery=False, sample_size=False, test_mode=False, quiet=False):
     """Main function to process bridge transaction data."""
     ProgressIndicators.print_header("BRIDGE DATA PROCESSING PIPELINE")
 
@@ -791,29 +890,28 @@ def main(skip_bigquery=False, sample_size=False, test_mode=False):
 
         # Combine the deposit and withdrawal data tables
         ProgressIndicators.print_step("Combining deposit and withdrawal data", "start")
-        combined = pd.concat(
-            [deposits_clean, withdrawals_clean], ignore_index=True
-        ).fillna(0)
+        combined = pd.concat([deposits_clean, withdrawals_clean], ignore_index=True)
+        # Only fill side-specific columns (e.g. depositor vs. withdrawer/chain) and the
+        # value columns that can be NaN from unpriced or unparsable amounts
+        side_cols = deposits_clean.columns.symmetric_difference(withdrawals_clean.columns)
+        fill_cols = [*side_cols, 'amount', 'amount_usd']
+        combined[fill_cols] = combined[fill_cols].fillna(0)
         combined = combined.sort_values('timestamp_').reset_index(drop=True)
         ProgressIndicators.print_step(f"Combined {len(combined)} total bridge transactions", "success")
 
         # Calculate net flow, tvl, volume
         ProgressIndicators.print_step("Calculating net flow, TVL, and volume", "start")        
-        combined['net_flow'] = np.where(
-            combined['type'] == 'deposit',
-            combined['amount_usd'],
-            -combined['amount_usd']
+        # One deposit mask splits each amount into its deposit/withdrawal leg; every row is
+        # one or the other, so the withdrawal leg is the remainder and volume is the amount
+        amount_usd = combined['amount_usd'].to_numpy()
+        deposit_amount_usd = amount_usd * (combined['type'].to_numpy() == 'deposit')
+        withdrawal_amount_usd = amount_usd - deposit_amount_usd
+        combined = combined.assign(
+            net_flow=deposit_amount_usd - withdrawal_amount_usd,
+            deposit_amount_usd=deposit_amount_usd,
+            withdrawal_amount_usd=withdrawal_amount_usd,
+            volume=amount_usd
         )
-        combined['deposit_amount_usd'] = np.where(
-            combined['type'] == 'deposit',
-            combined['amount_usd'], 0
-        )
-        combined['withdrawal_amount_usd'] = np.where(
-            combined['type'] == 'withdrawal',
-            combined['amount_usd'], 0
-        )
-        combined['volume'] = combined['withdrawal_amount_usd'] + combined['deposit_amount_usd']
-        combined['tvl'] = combined['net_flow'].cumsum() 
         ProgressIndicators.print_step("Calculations complete", "success")
 
     # ==================================================
@@ -821,29 +919,33 @@ def main(skip_bigquery=False, sample_size=False, test_mode=False):
     # ==================================================
         
         ProgressIndicators.print_step("Aggregating TVL data by day", "start")
-        tvl = combined.copy()
-
-        daily_tvl = tvl.groupby(['timestamp_']).agg(
-                # TVL metrics (end of day values)
-                tvl = ('tvl', 'last'),
+        daily_tvl = combined.groupby(['timestamp_']).agg(
                 net_flow = ('net_flow', 'sum'),  # Net daily flow
                 deposits_usd = ('deposit_amount_usd', 'sum'),  # Total daily deposits
                 withdrawals_usd = ('withdrawal_amount_usd', 'sum'),  # Total daily withdrawals
                 tx_type = ('type', 'count'),  # Total transactions
             ).reset_index()
-
-        # Calculate deposit and withdrawal counts
-        deposit_counts = tvl[tvl['type'] == 'deposit'].groupby(['timestamp_']).size()
-        depositors = tvl[tvl['type'] == 'deposit'].groupby(['timestamp_'])['depositor'].nunique()
-        withdrawal_counts = tvl[tvl['type'] == 'withdrawal'].groupby(['timestamp_']).size()
-        withdrawers = tvl[tvl['type'] == 'withdrawal'].groupby(['timestamp_'])['withdrawer'].nunique()
+        # End-of-day TVL is the running total of the daily net flows
+        daily_tvl.insert(1, 'tvl', daily_tvl['net_flow'].cumsum())
+
+        # Calculate deposit and withdrawal counts in one (day, type) groupby; a day without
+        # one of the types counts 0 on that side, so the count columns stay int64
+        by_type = combined.groupby(['timestamp_', 'type'], observed=True).agg(
+            count=('type', 'size'),
+            depositors=('depositor', 'nunique'),
+            withdrawers=('withdrawer', 'nunique')
+        ).unstack('type', fill_value=0)
+        by_type = by_type.reindex(
+            columns=pd.MultiIndex.from_product([by_type.columns.levels[0], ['deposit', 'withdrawal']]),
+            fill_value=0
+        )
             
         # Add transaction counts to daily metrics
         daily_tvl = daily_tvl.set_index(['timestamp_'])
-        daily_tvl['deposits'] = deposit_counts
-        daily_tvl['depositors'] = depositors
-        daily_tvl['withdrawals'] = withdrawal_counts
-        daily_tvl['withdrawers'] = withdrawers
+        daily_tvl['deposits'] = by_type[('count', 'deposit')]
+        daily_tvl['depositors'] = by_type[('depositors', 'deposit')]
+        daily_tvl['withdrawals'] = by_type[('count', 'withdrawal')]
+        daily_tvl['withdrawers'] = by_type[('withdrawers', 'withdrawal')]
         daily_tvl['unique_wallets'] = daily_tvl['withdrawers'] + daily_tvl['depositors']
         daily_tvl['total_transactions'] = daily_tvl['deposits'] + daily_tvl['withdrawals']
         daily_tvl = daily_tvl.fillna(0).reset_index()
@@ -864,9 +966,14 @@ def main(skip_bigquery=False, sample_size=False, test_mode=False):
             (daily_tvl['tvl'] - daily_tvl['tvl_ath']) / 
             daily_tvl['tvl_ath']
         )
-        for col in ['deposits', 'withdrawals', 'net_flow']:
-            daily_tvl[f'{col}_ma7'] = daily_tvl[col].rolling(window=7).mean()
-            daily_tvl[f'{col}_ma30'] = daily_tvl[col].rolling(window=7).mean()
+        # One multi-column rolling pass. The published _ma30 columns of agg_bridge_daily-tvl
+        # have always held the 7-day mean; the table is append-only, so switching them to a
+        # real 30-day window needs a backfill and is left out of this pass
+        ma_cols = ['deposits', 'withdrawals', 'net_flow']
+        ma7 = daily_tvl[ma_cols].rolling(window=7).mean()
+        for col in ma_cols:
+            daily_tvl[f'{col}_ma7'] = ma7[col]
+            daily_tvl[f'{col}_ma30'] = ma7[col]
 
         daily_tvl = daily_tvl.fillna(0)
         ProgressIndicators.print_step("Aggregation complete", "success")
@@ -963,7 +1070,7 @@ def main(skip_bigquery=False, sample_size=False, test_mode=False):
                     ProgressIndicators.print_step(f"Uploaded {table_name} to BigQuery", "success")
 
         # Display summary
-        display_summary(metrics, combined)
+        display_summary(metrics, combined, quiet=quiet)
 
         # Generate and save markdown report
         # ProgressIndicators.print_step("Generating markdown report", "start")
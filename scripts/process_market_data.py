@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from dotenv import load_dotenv
 import pandas as pd
 
@@ -166,17 +168,24 @@ def main(test_mode=False, skip_bigquery=False):
         # FETCH RAW DATA
         # ==========================================================
 
-        # fetches the store_redemption_codes table from supabase
-        redemption_codes = fetch_redemption_codes(supabase)
-
-        # fetches donations and purchases from market-mezo subgraph (1.0.0)
-        donations = get_all_market_txns(
-            SubgraphClient.MUSD_MARKET_SUBGRAPH, MUSDQueries.GET_MARKET_DONATIONS, "donateds"
-        )
-
-        purchases = get_all_market_txns(
-            SubgraphClient.MUSD_MARKET_SUBGRAPH, MUSDQueries.GET_MARKET_PURCHASES, "orderPlaceds"
-        )
+        # The three sources share no state, so their network round-trips overlap
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # fetches the store_redemption_codes table from supabase
+            redemption_codes_future = executor.submit(fetch_redemption_codes, supabase)
+
+            # fetches donations and purchases from market-mezo subgraph (1.0.0)
+            donations_future = executor.submit(
+                get_all_market_txns,
+                SubgraphClient.MUSD_MARKET_SUBGRAPH, MUSDQueries.GET_MARKET_DONATIONS, "donateds"
+            )
+            purchases_future = executor.submit(
+                get_all_market_txns,
+                SubgraphClient.MUSD_MARKET_SUBGRAPH, MUSDQueries.GET_MARKET_PURCHASES, "orderPlaceds"
+            )
+
+            redemption_codes = redemption_codes_future.result()
+            donations = donations_future.result()
+            purchases = purchases_future.result()
 
         ProgressIndicators.print_step(
             f"Loaded {len(donations)} donations and {len(purchases)} purchases", "success"
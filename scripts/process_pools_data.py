@@ -248,14 +248,14 @@ def calculate_tvl_and_daily_metrics(deposits_df, withdrawals_df):
         'sender': 'nunique'
     }).reset_index()
     
-    # Calculate deposit and withdrawal counts
-    deposit_counts = combined[combined['transaction_type'] == 'deposit'].groupby(['timestamp_', 'pool']).size()
-    withdrawal_counts = combined[combined['transaction_type'] == 'withdrawal'].groupby(['timestamp_', 'pool']).size()
+    # Calculate deposit and withdrawal counts in one (day, pool, type) pass
+    type_counts = combined.groupby(['timestamp_', 'pool', 'transaction_type']).size().unstack('transaction_type')
+    type_counts = type_counts.reindex(columns=['deposit', 'withdrawal'])
     
     # Add transaction counts to daily metrics
     daily_pool_metrics = daily_pool_metrics.set_index(['timestamp_', 'pool'])
-    daily_pool_metrics['deposit_count'] = deposit_counts
-    daily_pool_metrics['withdrawal_count'] = withdrawal_counts
+    daily_pool_metrics['deposit_count'] = type_counts['deposit']
+    daily_pool_metrics['withdrawal_count'] = type_counts['withdrawal']
     daily_pool_metrics = daily_pool_metrics.fillna(0).reset_index()
     
     daily_pool_metrics.columns = [
@@ -329,8 +329,10 @@ def calculate_tvl_and_daily_metrics(deposits_df, withdrawals_df):
     daily_pool_metrics_all['protocol_tvl_change'] = daily_pool_metrics_all['protocol_tvl_total'].diff()
     daily_pool_metrics_all['protocol_tvl_change_pct'] = daily_pool_metrics_all['protocol_tvl_total'].pct_change() * 100
     
-    for metric in ['protocol_tvl_total', 'protocol_daily_deposits', 'protocol_daily_withdrawals', 'protocol_daily_net_flow']:
-        daily_pool_metrics_all[f'{metric}_ma7'] = daily_pool_metrics_all[metric].rolling(window=7, min_periods=1).mean()
+    ma_metrics = ['protocol_tvl_total', 'protocol_daily_deposits', 'protocol_daily_withdrawals', 'protocol_daily_net_flow']
+    ma7 = daily_pool_metrics_all[ma_metrics].rolling(window=7, min_periods=1).mean()
+    for metric in ma_metrics:
+        daily_pool_metrics_all[f'{metric}_ma7'] = ma7[metric]
     
     # =========================================
     # CURRENT TVL SNAPSHOT
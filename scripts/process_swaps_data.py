@@ -123,16 +123,20 @@ def get_swaps_by_pool(df):
 @with_progress("Creating daily time series")
 def get_daily_swaps(df):
     """Aggregate swap data by date for time series analysis"""
-    df['date'] = pd.to_datetime(df['timestamp']).dt.date
-    df = df.sort_values(['date']).reset_index(drop=True)
+    # Group on the datetime64 day (int64 keys, already sorted by groupby) and only turn
+    # the aggregated days back into date objects. The per-row date uploaded with
+    # swaps_with_metrics is cast in Arrow, so it stays a DATE without a Python object per row
+    day = pd.to_datetime(df['timestamp']).dt.normalize()
+    df['date'] = day.astype('date32[pyarrow]')
 
-    daily_metrics = df.groupby('date').agg(
+    daily_metrics = df.groupby(day.rename('date')).agg(
         daily_volume=('total_volume', 'sum'),
         daily_fees=('total_fees', 'sum'),
         swap_count=('transactionHash_', 'count'),
         users=('user', 'nunique'),
         avg_swap_size=('total_volume', 'mean')
     ).reset_index()
+    daily_metrics['date'] = daily_metrics['date'].dt.date
     
     # Add cumulative metrics
     daily_metrics['cumulative_volume'] = daily_metrics['daily_volume'].cumsum()
@@ -147,14 +151,16 @@ def get_daily_swaps(df):
 @with_progress("Creating pool-date aggregations")
 def create_swaps_daily_metrics(df):
     """Aggregate by both pool and date for detailed analysis"""
-    df['date'] = pd.to_datetime(df['timestamp']).dt.date
+    day = pd.to_datetime(df['timestamp']).dt.normalize()
+    df['date'] = day.astype('date32[pyarrow]')
     
-    swaps_daily = df.groupby(['date', 'pool']).agg(
+    swaps_daily = df.groupby([day.rename('date'), 'pool']).agg(
         daily_volume=('total_volume', 'sum'),
         daily_fees=('total_fees', 'sum'),
         swap_count=('transactionHash_', 'count'),
         users=('user', 'nunique')
     ).reset_index()
+    swaps_daily['date'] = swaps_daily['date'].dt.date
     
     return swaps_daily
 
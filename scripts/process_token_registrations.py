@@ -74,22 +74,34 @@ def upload_to_bigquery(df, dataset, table, identifier, bq):
     if df is not None and len(df) > 0:
         bq.update_table(df, dataset, table, identifier)
 
+def count_registrations(stg):
+    """Registrations (non-null addresses) today, in the last 7 days, all-time and per token preference"""
+    has_address = stg['address'].notna()
+    updated_on = stg["updated_at"].astype(str)
+    by_preference = stg.loc[has_address, 'token_preference'].value_counts()
+
+    return {
+        'today': (has_address & (updated_on == date.today().strftime("%Y-%m-%d"))).sum(),
+        '7d': (has_address & (updated_on >= (date.today() - timedelta(days=7)).strftime("%Y-%m-%d"))).sum(),
+        'all': has_address.sum(),
+        'liquid': by_preference.get('liquid', 0),
+        'locked': by_preference.get('locked', 0),
+    }
+
 @with_progress("Printing summary statistics")
 def print_summary(stg):
-    df_all = stg.copy()
-    df_today = stg[stg["updated_at"].astype(str) == date.today().strftime("%Y-%m-%d")]
-    df_7d = stg[stg["updated_at"].astype(str) >= (date.today() - timedelta(days=7)).strftime("%Y-%m-%d")]
+    counts = count_registrations(stg)
 
     print(f"\n{'─' * 60}")
     print("TOKEN REGISTRATIONS SUMMARY \n")
 
-    print(f"Total registrations today:      {df_today['address'].count():,}")
-    print(f"Total registrations 7d:         {df_7d['address'].count():,}")
-    print(f"Total registrations:            {df_all['address'].count():,}")
-    print(f"Total liquid registrations:     {df_all[df_all['token_preference'] == 'liquid']['address'].count():,}")
-    print(f"Total locked registrations:     {df_all[df_all['token_preference'] == 'locked']['address'].count():,}")
-    print(f"Percentage of liquid registrations: {df_all[df_all['token_preference'] == 'liquid']['address'].count() / df_all['address'].count():.2%}")
-    print(f"Percentage of locked registrations: {df_all[df_all['token_preference'] == 'locked']['address'].count() / df_all['address'].count():.2%}")
+    print(f"Total registrations today:      {counts['today']:,}")
+    print(f"Total registrations 7d:         {counts['7d']:,}")
+    print(f"Total registrations:            {counts['all']:,}")
+    print(f"Total liquid registrations:     {counts['liquid']:,}")
+    print(f"Total locked registrations:     {counts['locked']:,}")
+    print(f"Percentage of liquid registrations: {counts['liquid'] / counts['all']:.2%}")
+    print(f"Percentage of locked registrations: {counts['locked'] / counts['all']:.2%}")
     
     print(f"{'─' * 60}\n")
 
@@ -105,15 +117,13 @@ def send_discord_summary(stg, webhook_url):
     try:
         print("\n🔔 Attempting to send Discord summary...")
         
-        df_all = stg.copy()
-        df_today = stg[stg["updated_at"].astype(str) == date.today().strftime("%Y-%m-%d")]
-        df_7d = stg[stg["updated_at"].astype(str) >= (date.today() - timedelta(days=7)).strftime("%Y-%m-%d")]
+        counts = count_registrations(stg)
         
-        total_today = df_today['address'].count()
-        total_7d = df_7d['address'].count()
-        total_all = df_all['address'].count()
-        total_liquid = df_all[df_all['token_preference'] == 'liquid']['address'].count()
-        total_locked = df_all[df_all['token_preference'] == 'locked']['address'].count()
+        total_today = counts['today']
+        total_7d = counts['7d']
+        total_all = counts['all']
+        total_liquid = counts['liquid']
+        total_locked = counts['locked']
         
         # Format numbers with commas
         def format_number(num):
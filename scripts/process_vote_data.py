@@ -146,22 +146,30 @@ def save_to_csv(df, name):
     
     df.to_csv(output_path)
 
+def sum_by_token(df):
+    """Staked amount and earnings per token in one grouped pass (0 for tokens with no rows)"""
+    return df.groupby('token')[['amount', 'total_earned']].sum().reindex(['veBTC', 'veMEZO'], fill_value=0)
+
 @with_progress("Getting summary stake and vote statistics")
 def print_summary_stake_and_vote_statistics(df):
     
+    # Stake dates as strings once, shared by every period filter below
+    date_staked = df["date_staked"].astype(str)
+    
     # today stats
-    df_today = df[df["date_staked"].astype(str) == date.today().strftime("%Y-%m-%d")]
+    df_today = df[date_staked == date.today().strftime("%Y-%m-%d")]
+    df_today_by_token = sum_by_token(df_today)
     
     print(f"\n{'─' * 60}")
     print(f"{date.today()}: STAKE & VOTE SUMMARY \n")
     
-    print(f"veBTC staked today:              {df_today[df_today['token'] == 'veBTC']['amount'].sum():,.6f}")
-    print(f"veMEZO staked today:             {df_today[df_today['token'] == 'veMEZO']['amount'].sum():,.6f}")
+    print(f"veBTC staked today:              {df_today_by_token.at['veBTC', 'amount']:,.6f}")
+    print(f"veMEZO staked today:             {df_today_by_token.at['veMEZO', 'amount']:,.6f}")
     print(f"Total stakes today:              {df_today['wallet_address'].count():,}")
     print(f"Total stakers today:             {df_today['wallet_address'].nunique():,}")
     print(f"Permanent locks today:           {df_today[df_today['is_permanent'] == True]['wallet_address'].count():,}")
-    print(f"Total veBTC earned today:        {df_today[df_today['token'] == 'veBTC']['total_earned'].sum():,.6f}")
-    print(f"Total veMEZO earned today:       {df_today[df_today['token'] == 'veMEZO']['total_earned'].sum():,.6f}")
+    print(f"Total veBTC earned today:        {df_today_by_token.at['veBTC', 'total_earned']:,.6f}")
+    print(f"Total veMEZO earned today:       {df_today_by_token.at['veMEZO', 'total_earned']:,.6f}")
     
     print(f"{'─' * 60}\n")
 
@@ -179,20 +187,21 @@ def print_summary_stake_and_vote_statistics(df):
     
     # Filter data for current epoch
     df_epoch = df[
-        (df["date_staked"].astype(str) >= epoch_start.strftime("%Y-%m-%d")) &
-        (df["date_staked"].astype(str) <= epoch_end.strftime("%Y-%m-%d"))
+        (date_staked >= epoch_start.strftime("%Y-%m-%d")) &
+        (date_staked <= epoch_end.strftime("%Y-%m-%d"))
     ]
+    df_epoch_by_token = sum_by_token(df_epoch)
     
     print(f"\n{'─' * 60}")
     print(f"EPOCH {current_epoch} STAKE & VOTE SUMMARY ({epoch_start} to {epoch_end}) \n")
     
-    print(f"veBTC staked epoch {current_epoch}:        {df_epoch[df_epoch['token'] == 'veBTC']['amount'].sum():,.6f}")
-    print(f"veMEZO staked epoch {current_epoch}:       {df_epoch[df_epoch['token'] == 'veMEZO']['amount'].sum():,.6f}")
+    print(f"veBTC staked epoch {current_epoch}:        {df_epoch_by_token.at['veBTC', 'amount']:,.6f}")
+    print(f"veMEZO staked epoch {current_epoch}:       {df_epoch_by_token.at['veMEZO', 'amount']:,.6f}")
     print(f"Total stakes epoch {current_epoch}:       {df_epoch['wallet_address'].count():,}")
     print(f"Total stakers epoch {current_epoch}:      {df_epoch['wallet_address'].nunique():,}")
     print(f"Permanent locks epoch {current_epoch}:    {df_epoch[df_epoch['is_permanent'] == True]['wallet_address'].count():,}")
-    print(f"Total veBTC earned epoch {current_epoch}: {df_epoch[df_epoch['token'] == 'veBTC']['total_earned'].sum():,.6f}")
-    print(f"Total veMEZO earned epoch {current_epoch}: {df_epoch[df_epoch['token'] == 'veMEZO']['total_earned'].sum():,.6f}")
+    print(f"Total veBTC earned epoch {current_epoch}: {df_epoch_by_token.at['veBTC', 'total_earned']:,.6f}")
+    print(f"Total veMEZO earned epoch {current_epoch}: {df_epoch_by_token.at['veMEZO', 'total_earned']:,.6f}")
     
     print(f"{'─' * 60}\n")
 
@@ -206,54 +215,57 @@ def print_summary_stake_and_vote_statistics(df):
         
         # Filter data for last complete epoch
         df_last_epoch = df[
-            (df["date_staked"].astype(str) >= last_epoch_start.strftime("%Y-%m-%d")) &
-            (df["date_staked"].astype(str) <= last_epoch_end.strftime("%Y-%m-%d"))
+            (date_staked >= last_epoch_start.strftime("%Y-%m-%d")) &
+            (date_staked <= last_epoch_end.strftime("%Y-%m-%d"))
         ]
+        df_last_epoch_by_token = sum_by_token(df_last_epoch)
         
         print(f"\n{'─' * 60}")
         print(f"LAST COMPLETE EPOCH {last_complete_epoch} STAKE & VOTE SUMMARY ({last_epoch_start} to {last_epoch_end}) \n")
         
-        print(f"veBTC staked epoch {last_complete_epoch}:        {df_last_epoch[df_last_epoch['token'] == 'veBTC']['amount'].sum():,.6f}")
-        print(f"veMEZO staked epoch {last_complete_epoch}:       {df_last_epoch[df_last_epoch['token'] == 'veMEZO']['amount'].sum():,.6f}")
+        print(f"veBTC staked epoch {last_complete_epoch}:        {df_last_epoch_by_token.at['veBTC', 'amount']:,.6f}")
+        print(f"veMEZO staked epoch {last_complete_epoch}:       {df_last_epoch_by_token.at['veMEZO', 'amount']:,.6f}")
         print(f"Total stakes epoch {last_complete_epoch}:       {df_last_epoch['wallet_address'].count():,}")
         print(f"Total stakers epoch {last_complete_epoch}:      {df_last_epoch['wallet_address'].nunique():,}")
         print(f"Permanent locks epoch {last_complete_epoch}:    {df_last_epoch[df_last_epoch['is_permanent'] == True]['wallet_address'].count():,}")
-        print(f"Total veBTC earned epoch {last_complete_epoch}: {df_last_epoch[df_last_epoch['token'] == 'veBTC']['total_earned'].sum():,.6f}")
-        print(f"Total veMEZO earned epoch {last_complete_epoch}: {df_last_epoch[df_last_epoch['token'] == 'veMEZO']['total_earned'].sum():,.6f}")
+        print(f"Total veBTC earned epoch {last_complete_epoch}: {df_last_epoch_by_token.at['veBTC', 'total_earned']:,.6f}")
+        print(f"Total veMEZO earned epoch {last_complete_epoch}: {df_last_epoch_by_token.at['veMEZO', 'total_earned']:,.6f}")
         
         print(f"{'─' * 60}\n")
 
     # 7-day stats
-    df_7d = df[df["date_staked"].astype(str) >= (date.today() - timedelta(days=7)).strftime("%Y-%m-%d")]
+    df_7d = df[date_staked >= (date.today() - timedelta(days=7)).strftime("%Y-%m-%d")]
+    df_7d_by_token = sum_by_token(df_7d)
 
     print(f"\n{'─' * 60}")
     print("7-DAY STAKE & VOTE SUMMARY \n")
 
-    print(f"veBTC staked 7d:              {df_7d[df_7d['token'] == 'veBTC']['amount'].sum():,.6f}")
-    print(f"veMEZO staked 7d:             {df_7d[df_7d['token'] == 'veMEZO']['amount'].sum():,.6f}")
+    print(f"veBTC staked 7d:              {df_7d_by_token.at['veBTC', 'amount']:,.6f}")
+    print(f"veMEZO staked 7d:             {df_7d_by_token.at['veMEZO', 'amount']:,.6f}")
     print(f"Total stakes 7d:              {df_7d['wallet_address'].count():,}")
     print(f"Total stakers 7d:             {df_7d['wallet_address'].nunique():,}")
     print(f"Permanent locks 7d:           {df_7d[df_7d['is_permanent'] == True]['wallet_address'].count():,}")
-    print(f"Total veBTC earned 7d:        {df_7d[df_7d['token'] == 'veBTC']['total_earned'].sum():,.6f}")
-    print(f"Total veMEZO earned 7d:       {df_7d[df_7d['token'] == 'veMEZO']['total_earned'].sum():,.6f}")
+    print(f"Total veBTC earned 7d:        {df_7d_by_token.at['veBTC', 'total_earned']:,.6f}")
+    print(f"Total veMEZO earned 7d:       {df_7d_by_token.at['veMEZO', 'total_earned']:,.6f}")
     
     print(f"{'─' * 60}\n")
 
     # total stats
 
     df_public = df[df["date_staked"] >= '2025-12-18'] # launch date
+    df_by_token = sum_by_token(df)
     print(df_public['is_permanent'].value_counts())
 
     print(f"\n{'─' * 60}")
     print("ALL-TIME STAKE & VOTE SUMMARY \n")
 
-    print(f"Total veBTC staked:            {df[df["token"] == "veBTC"]["amount"].sum():,.6f}")
-    print(f"Total veMEZO staked:           {df[df["token"] == "veMEZO"]["amount"].sum():,.6f}")
+    print(f"Total veBTC staked:            {df_by_token.at['veBTC', 'amount']:,.6f}")
+    print(f"Total veMEZO staked:           {df_by_token.at['veMEZO', 'amount']:,.6f}")
     print(f"Total stakes:                  {df_public["wallet_address"].count():,}")
     print(f"Total stakers:                 {df_public["wallet_address"].nunique():,}")
     print(f"Total permanent locks:         {df_public[df_public["is_permanent"] == True]["wallet_address"].count():,}")
-    print(f"Total veBTC earned:            {df[df["token"] == "veBTC"]["total_earned"].sum():,.6f}")
-    print(f"Total veMEZO earned:           {df[df["token"] == "veMEZO"]["total_earned"].sum():,.6f}")
+    print(f"Total veBTC earned:            {df_by_token.at['veBTC', 'total_earned']:,.6f}")
+    print(f"Total veMEZO earned:           {df_by_token.at['veMEZO', 'total_earned']:,.6f}")
     
     print(f"{'─' * 60}\n")
 